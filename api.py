@@ -8,16 +8,22 @@ Usage:
     uv run api.py [--port 8000] [--host 0.0.0.0]
 """
 
+import asyncio
 import os
+import sys
 from pathlib import Path
-from typing import Any
+from collections.abc import Sequence
+from typing import Annotated, Any
 import httpx
+import orjson
 
 import uvicorn
 import argparse
 from contextlib import asynccontextmanager
+from functools import lru_cache
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 
@@ -28,7 +34,7 @@ from src.retriever import VimproveRetriever
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown events."""
     # Startup
-    global retriever, openrouter_key
+    global retriever, openrouter_key, http_client
 
     cache_dir = Path(os.environ.get("VIMPROVE_CACHE_DIR", "./vimprove-cache")).resolve()
     openrouter_key = os.environ.get("OPENROUTER_API_KEY")
@@ -37,11 +43,30 @@ async def lifespan(app: FastAPI):
         print("Warning: OPENROUTER_API_KEY not set. Query endpoint will fail.")
 
     print(f"Loading retriever from {cache_dir}...")
-    retriever = VimproveRetriever(cache_dir)
+    retriever = VimproveRetriever(
+        cache_dir,
+        index_backend=os.environ.get("VIMPROVE_INDEX_BACKEND", "chroma"),
+        model_backend=os.environ.get("VIMPROVE_MODEL_BACKEND", "torch"),
+    )
+    _cached_search.cache_clear()
     print(f"✓ Retriever ready ({retriever.collection.count()} chunks)")
 
+    # Shared client so OpenRouter calls reuse pooled keep-alive connections,
+    # multiplexing concurrent streams over HTTP/2
+    http_client = httpx.AsyncClient(
+        http2=True,
+        timeout=httpx.Timeout(60.0, connect=5.0),
+        limits=httpx.Limits(
+            max_keepalive_connections=50, max_connections=200, keepalive_expiry=30.0
+        ),
+    )
+
     yield  # App runs here
 
+    # Shutdown
+    await http_client.aclose()
+    http_client = None
+
 
 app = FastAPI(
     title="Vimprove API",
@@ -54,14 +79,35 @@ app = FastAPI(
 # Global retriever (loaded on startup)
 retriever: VimproveRetriever | None = None
 openrouter_key: str | None = None
+http_client: httpx.AsyncClient | None = None
+
+# Optional chunk metadata shown in the prompt, as (metadata key, label)
+PROMPT_METADATA_FIELDS = (
+    ("heading", "Heading"),  # vimdoc
+    ("tags", "Tags"),  # vimdoc
+    ("headings", "Section"),  # markdown
+)
+
+# Bound concurrent OpenRouter calls issued by /query/batch
+openrouter_semaphore = asyncio.Semaphore(20)
+
+
+class ORJSONResponse(Response):
+    """JSON response rendered with orjson, skipping jsonable_encoder."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
 
 
 class QueryRequest(BaseModel):
     query: str = Field(..., description="Natural language query about Neovim")
     context: str | None = Field(None, description="Optional config snippet for context")
     n_results: int = Field(10, ge=1, le=50, description="Number of chunks to retrieve")
-    source_filter: str | None = Field(
-        None, description="Filter by source (e.g., 'telescope.nvim')"
+    source_filter: str | Annotated[list[str], Field(min_length=1)] | None = Field(
+        None,
+        description="Filter by source (e.g., 'telescope.nvim'), or any of a list",
     )
     model: str = Field(
         "anthropic/claude-4.5-sonnet", description="OpenRouter model to use"
@@ -78,6 +124,16 @@ class QueryResponse(BaseModel):
     model_used: str
 
 
+class BatchQueryRequest(BaseModel):
+    queries: list[QueryRequest] = Field(
+        ..., min_length=1, max_length=50, description="Queries to run concurrently"
+    )
+
+
+class BatchQueryResponse(BaseModel):
+    results: list[QueryResponse]
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
@@ -97,11 +153,12 @@ async def query(request: QueryRequest):
     if not openrouter_key:
         raise HTTPException(status_code=500, detail="OPENROUTER_API_KEY not set")
 
-    # Retrieve relevant chunks
-    results = retriever.search(
-        query=request.query,
-        n_results=request.n_results,
-        source_filter=request.source_filter,
+    # Retrieve relevant chunks (sync embedding + Chroma search, keep it off the loop)
+    results = await run_in_threadpool(
+        _cached_search,
+        request.query,
+        request.n_results,
+        _filter_key(request.source_filter),
     )
 
     if not results:
@@ -115,25 +172,71 @@ async def query(request: QueryRequest):
         prompt=prompt, model=request.model, max_tokens=request.max_tokens
     )
 
-    # Format sources for response
-    sources = [
+    # response_model stays for the OpenAPI schema; the body is rendered directly
+    return ORJSONResponse(
         {
-            "source": r["metadata"]["source"],
-            "type": r["metadata"]["type"],
-            "heading": r["metadata"].get("heading"),  # vimdoc
-            "tags": r["metadata"].get("tags"),  # vimdoc
-            "headings": r["metadata"].get("headings"),  # markdown
-            "text": r["text"][:200] + "..." if len(r["text"]) > 200 else r["text"],
-            "distance": r["distance"],
+            "query": request.query,
+            "response": response_text,
+            "sources": format_sources(results),
+            "model_used": request.model,
         }
-        for r in results[:5]  # Top 5 sources only
-    ]
+    )
+
+
+@app.post("/query/batch", response_model=BatchQueryResponse)
+async def query_batch(request: BatchQueryRequest):
+    """
+    Batch version of query endpoint.
+    Runs retrieval and OpenRouter calls for all queries concurrently.
+    """
+    if not retriever:
+        raise HTTPException(status_code=503, detail="Retriever not initialized")
+
+    if not openrouter_key:
+        raise HTTPException(status_code=500, detail="OPENROUTER_API_KEY not set")
+
+    # Retrieve relevant chunks (Chroma is sync, so fan out over the threadpool)
+    all_results = await asyncio.gather(
+        *[
+            run_in_threadpool(
+                _cached_search, q.query, q.n_results, _filter_key(q.source_filter)
+            )
+            for q in request.queries
+        ]
+    )
+
+    for q, results in zip(request.queries, all_results):
+        if not results:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No relevant documentation found for query: {q.query}",
+            )
+
+    async def generate(q: QueryRequest, results: Sequence[dict[str, Any]]) -> str:
+        prompt = build_prompt(q.query, results, q.context)
+        async with openrouter_semaphore:
+            return await call_openrouter(
+                prompt=prompt, model=q.model, max_tokens=q.max_tokens
+            )
+
+    responses = await asyncio.gather(
+        *[generate(q, results) for q, results in zip(request.queries, all_results)]
+    )
 
-    return QueryResponse(
-        query=request.query,
-        response=response_text,
-        sources=sources,
-        model_used=request.model,
+    return ORJSONResponse(
+        {
+            "results": [
+                {
+                    "query": q.query,
+                    "response": response_text,
+                    "sources": format_sources(results),
+                    "model_used": q.model,
+                }
+                for q, results, response_text in zip(
+                    request.queries, all_results, responses
+                )
+            ]
+        }
     )
 
 
@@ -149,11 +252,12 @@ async def query_stream(request: QueryRequest):
     if not openrouter_key:
         raise HTTPException(status_code=500, detail="OPENROUTER_API_KEY not set")
 
-    # Retrieve relevant chunks
-    results = retriever.search(
-        query=request.query,
-        n_results=request.n_results,
-        source_filter=request.source_filter,
+    # Retrieve relevant chunks (sync embedding + Chroma search, keep it off the loop)
+    results = await run_in_threadpool(
+        _cached_search,
+        request.query,
+        request.n_results,
+        _filter_key(request.source_filter),
     )
 
     if not results:
@@ -162,44 +266,71 @@ async def query_stream(request: QueryRequest):
     # Build prompt
     prompt = build_prompt(request.query, results, request.context)
 
-    # Stream response
+    # Stream response, framing SSE events as bytes so Starlette skips re-encoding
     async def generate():
         async for chunk in stream_openrouter(
             prompt=prompt, model=request.model, max_tokens=request.max_tokens
         ):
-            yield f"data: {chunk}\n\n"
+            yield b"data: " + chunk.encode("utf-8") + b"\n\n"
 
     return StreamingResponse(generate(), media_type="text/event-stream")
 
 
-def build_prompt(query: str, results: list[dict[str, Any]], context: str | None) -> str:
+@lru_cache(maxsize=1024)
+def _cached_search(
+    query: str, n_results: int, source_filter: str | tuple[str, ...] | None
+) -> tuple[dict[str, Any], ...]:
+    """Memoized retriever search; repeated queries skip embedding and vector search."""
+    return tuple(
+        retriever.search(query=query, n_results=n_results, source_filter=source_filter)
+    )
+
+
+def _filter_key(source_filter: str | list[str] | None) -> str | tuple[str, ...] | None:
+    """Hashable form of a request's source filter, for the caches."""
+    if isinstance(source_filter, list):
+        return tuple(source_filter)
+    return source_filter
+
+
+def format_sources(results: Sequence[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Format the top retrieved chunks as response sources."""
+    return [
+        {
+            "source": r["metadata"]["source"],
+            "type": r["metadata"]["type"],
+            "heading": r["metadata"].get("heading"),  # vimdoc
+            "tags": r["metadata"].get("tags"),  # vimdoc
+            "headings": r["metadata"].get("headings"),  # markdown
+            "text": r["text"][:200] + "..." if len(r["text"]) > 200 else r["text"],
+            "distance": r["distance"],
+        }
+        for r in results[:5]  # Top 5 sources only
+    ]
+
+
+def build_prompt(
+    query: str, results: Sequence[dict[str, Any]], context: str | None
+) -> str:
     """Build prompt for LLM with retrieved docs and query."""
 
     # Format retrieved chunks
-    docs_text = "\n\n---\n\n".join(
-        [
-            f"**Source:** {r['metadata']['source']}\n"
-            + f"**Type:** {r['metadata']['type']}\n"
-            + (
-                f"**Heading:** {r['metadata']['heading']}\n"
-                if r["metadata"].get("heading")
-                else ""
-            )
-            + (
-                f"**Tags:** {r['metadata']['tags']}\n"
-                if r["metadata"].get("tags")
-                else ""
-            )
-            + (
-                f"**Section:** {r['metadata']['headings']}\n"
-                if r["metadata"].get("headings")
-                else ""
-            )
-            + "\n"
-            + r["text"]
-            for r in results
+    blocks = []
+    for r in results:
+        metadata = r["metadata"]
+        parts = [
+            f"**Source:** {metadata['source']}\n",
+            f"**Type:** {metadata['type']}\n",
         ]
-    )
+        parts.extend(
+            f"**{label}:** {metadata[key]}\n"
+            for key, label in PROMPT_METADATA_FIELDS
+            if metadata.get(key)
+        )
+        parts.append("\n")
+        parts.append(r["text"])
+        blocks.append("".join(parts))
+    docs_text = "\n\n---\n\n".join(blocks)
 
     context_section = ""
     if context:
@@ -235,87 +366,83 @@ If the docs don't fully answer the question, say so."""
 
 async def call_openrouter(prompt: str, model: str, max_tokens: int) -> str:
     """Call OpenRouter API for completion."""
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        response = await client.post(
-            "https://openrouter.ai/api/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {openrouter_key}",
-                "HTTP-Referer": "https://www.github.com/rlarson20/Vimprove",
-                "X-Title": "Vimprove",
-                "Content-Type": "application/json",
-            },
-            json={
-                "model": model,
-                "messages": [{"role": "user", "content": prompt}],
-                "max_tokens": max_tokens,
-            },
+    response = await http_client.post(
+        "https://openrouter.ai/api/v1/chat/completions",
+        headers={
+            "Authorization": f"Bearer {openrouter_key}",
+            "HTTP-Referer": "https://www.github.com/rlarson20/Vimprove",
+            "X-Title": "Vimprove",
+            "Content-Type": "application/json",
+        },
+        json={
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": max_tokens,
+        },
+    )
+    if response.status_code != 200:
+        raise HTTPException(
+            status_code=response.status_code,
+            detail=f"OpenRouter API error: {response.text}",
         )
-        if response.status_code != 200:
-            raise HTTPException(
-                status_code=response.status_code,
-                detail=f"OpenRouter API error: {response.text}",
-            )
 
-        data = response.json()
-        return data["choices"][0]["message"]["content"]
+    data = response.json()
+    return data["choices"][0]["message"]["content"]
 
 
 async def stream_openrouter(prompt: str, model: str, max_tokens: int):
     """Stream response from OpenRouter API."""
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        async with client.stream(
-            "POST",
-            "https://openrouter.ai/api/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {openrouter_key}",
-                "HTTP-Referer": "https://www.github.com/rlarson20/Vimprove",
-                "X-Title": "Vimprove",
-                "Content-Type": "application/json",
-            },
-            json={
-                "model": model,
-                "messages": [{"role": "user", "content": prompt}],
-                "max_tokens": max_tokens,
-                "stream": True,
-            },
-        ) as response:
-            if response.status_code != 200:
-                error_text = await response.aread()
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"OpenRouter API error: {error_text.decode()}",
-                )
-
-            async for line in response.aiter_lines():
-                if line.startswith("data: "):
-                    data = line[6:]
-                    if data == "[DONE]":
-                        break
+    async with http_client.stream(
+        "POST",
+        "https://openrouter.ai/api/v1/chat/completions",
+        headers={
+            "Authorization": f"Bearer {openrouter_key}",
+            "HTTP-Referer": "https://www.github.com/rlarson20/Vimprove",
+            "X-Title": "Vimprove",
+            "Content-Type": "application/json",
+        },
+        json={
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": max_tokens,
+            "stream": True,
+        },
+    ) as response:
+        if response.status_code != 200:
+            error_text = await response.aread()
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"OpenRouter API error: {error_text.decode()}",
+            )
 
-                    # Handle empty or malformed data
-                    if not data.strip():
-                        continue
+        async for line in response.aiter_lines():
+            if line.startswith("data: "):
+                data = line[6:]
+                if data == "[DONE]":
+                    break
 
-                    try:
-                        import json
+                # Handle empty or malformed data
+                if not data.strip():
+                    continue
 
-                        chunk = json.loads(data)
+                try:
+                    chunk = orjson.loads(data)
 
-                        # Safely navigate the nested structure
-                        if (
-                            chunk.get("choices")
-                            and len(chunk["choices"]) > 0
-                            and chunk["choices"][0].get("delta")
-                            and chunk["choices"][0]["delta"].get("content")
-                        ):
-                            yield chunk["choices"][0]["delta"]["content"]
+                    # Safely navigate the nested structure
+                    if (
+                        chunk.get("choices")
+                        and len(chunk["choices"]) > 0
+                        and chunk["choices"][0].get("delta")
+                        and chunk["choices"][0]["delta"].get("content")
+                    ):
+                        yield chunk["choices"][0]["delta"]["content"]
 
-                    except json.JSONDecodeError:
-                        # Handle malformed JSON specifically
-                        continue
-                    except (KeyError, IndexError, TypeError):
-                        # Handle missing keys, empty arrays, or wrong types
-                        continue
+                except orjson.JSONDecodeError:
+                    # Handle malformed JSON specifically
+                    continue
+                except (KeyError, IndexError, TypeError):
+                    # Handle missing keys, empty arrays, or wrong types
+                    continue
 
 
 def main():
@@ -323,10 +450,31 @@ def main():
     parser.add_argument("--host", default="127.0.0.1", help="Host to bind to")
     parser.add_argument("--port", type=int, default=8000, help="Port to bind to")
     parser.add_argument("--reload", action="store_true", help="Enable auto-reload")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=(
+            "Worker processes; each loads its own retriever "
+            f"(suggested for this machine: {(os.cpu_count() or 1) * 2 + 1})"
+        ),
+    )
     args = parser.parse_args()
 
+    if args.reload and args.workers > 1:
+        parser.error("--reload cannot be combined with --workers > 1")
+
     load_dotenv()
-    uvicorn.run("api:app", host=args.host, port=args.port, reload=args.reload)
+    uvicorn.run(
+        "api:app",
+        host=args.host,
+        port=args.port,
+        reload=args.reload,
+        workers=args.workers,
+        # uvloop has no Windows build; fall back to the stdlib loop there
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+    )
 
 
 if __name__ == "__main__":
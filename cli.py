@@ -15,6 +15,44 @@ from rich.console import Console
 from rich.markdown import Markdown
 
 
+def stream_query(
+    client: httpx.Client,
+    payload: dict[str, str | None],
+    console: Console,
+    err_console: Console,
+    render_markdown: bool,
+) -> int:
+    """Stream response chunks straight to stdout; render markdown once at the end."""
+    status = console.status("[bold green]Querying documentation...")
+    status.start()
+    try:
+        with client.stream("POST", "/query/stream", json=payload) as response:
+            response.raise_for_status()
+            status.stop()
+
+            console.print("\n[bold cyan]Response:[/bold cyan]\n")
+
+            # Raw writes per chunk; Rich re-parses markup on every print call
+            parts = []
+            for line in response.iter_lines():
+                if line.startswith("data: "):
+                    chunk = line[6:]
+                    parts.append(chunk)
+                    sys.stdout.write(chunk)
+                    sys.stdout.flush()
+
+            sys.stdout.write("\n\n")
+    except httpx.HTTPError as e:
+        status.stop()
+        err_console.print(f"[bold red]Error:[/bold red] {e}")
+        return 1
+
+    if render_markdown:
+        console.print(Markdown("".join(parts)))
+
+    return 0
+
+
 def main():
     parser = argparse.ArgumentParser(description="Query Vimprove API")
     parser.add_argument("query", help="Your question about Neovim")
@@ -32,6 +70,11 @@ def main():
         action="store_true",
         help="Stream response (shows text as it's generated)",
     )
+    parser.add_argument(
+        "--markdown",
+        action="store_true",
+        help="With --stream, re-render the full response as markdown at the end",
+    )
 
     args = parser.parse_args()
 
@@ -45,43 +88,20 @@ def main():
 
     # Query API
     console = Console()
+    err_console = Console(stderr=True)
+    payload = {"query": args.query, "context": context, "model": args.model}
 
-    with console.status("[bold green]Querying documentation..."):
+    # One client per invocation so every request reuses its connection pool
+    with httpx.Client(base_url=args.api_url, timeout=60.0) as client:
         if args.stream:
-            # Stream response
-            try:
-                with httpx.stream(
-                    "POST",
-                    f"{args.api_url}/query/stream",
-                    json={"query": args.query, "context": context, "model": args.model},
-                    timeout=60.0,
-                ) as response:
-                    response.raise_for_status()
-
-                    console.print("\n[bold cyan]Response:[/bold cyan]\n")
-
-                    # Collect chunks for markdown rendering
-                    response_text = ""
-                    for line in response.iter_lines():
-                        if line.startswith("data: "):
-                            chunk = line[6:]
-                            response_text += chunk
-                            console.print(chunk, end="")
-
-                    console.print("\n")
-            except httpx.HTTPError as e:
-                console.print(f"[bold red]Error:[/bold red] {e}", file=sys.stderr)
-                return 1
-        else:
+            return stream_query(client, payload, console, err_console, args.markdown)
+
+        with console.status("[bold green]Querying documentation..."):
             try:
-                response = httpx.post(
-                    f"{args.api_url}/query",
-                    json={"query": args.query, "context": context, "model": args.model},
-                    timeout=60.0,
-                )
+                response = client.post("/query", json=payload)
                 response.raise_for_status()
             except httpx.HTTPError as e:
-                console.print(f"[bold red]Error:[/bold red] {e}", file=sys.stderr)
+                err_console.print(f"[bold red]Error:[/bold red] {e}")
                 return 1
 
     data = response.json()
@@ -8,10 +8,12 @@ Usage:
 """
 
 import argparse
-import json
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict
+
+import orjson
 
 from src.plugin_list_extractor import extract_plugin_list
 from src.github_release_tracker import ReleaseTracker
@@ -19,9 +21,12 @@ from src.vim_doc_chunker import chunk_vimdoc
 from src.readme_chunker import chunk_markdown
 from src.core_doc_fetcher import fetch_neovim_docs
 from src.plugin_doc_fetcher import PluginDocFetcher
-from src.chunk import save_chunks
+from src.chunk import chunk_corpus, save_chunks
 from src.error_logger import ErrorLogger
 
+# Concurrent GitHub fetches during plugin processing
+PLUGIN_FETCH_CONCURRENCY = 8
+
 
 class VimproveIngestion:
     def __init__(
@@ -35,7 +40,8 @@ class VimproveIngestion:
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.chunks_dir = self.cache_dir / "chunks"
 
-        self.error_logger = ErrorLogger(self.cache_dir / "errors.json")
+        self.error_logger = ErrorLogger(self.cache_dir / "errors.jsonl")
+        self._existing_chunks: dict[str, set[str]] = {}
         self.release_tracker = ReleaseTracker(
             cache_file=self.cache_dir / "releases.json", github_token=github_token
         )
@@ -46,28 +52,32 @@ class VimproveIngestion:
         print("Vimprove Documentation Ingestion")
         print("=" * 60)
 
-        # Step 1: Extract plugin list
-        print("\n[1/4] Extracting plugin list...")
-        plugins = self._extract_plugins()
-        print(f"  Found {len(plugins)} plugins to process")
+        self._existing_chunks.clear()
 
-        # Step 2: Process Neovim core docs
-        print("\n[2/4] Processing Neovim core documentation...")
-        self._process_neovim_core()
+        # Closes the release tracker's HTTP client even if a step raises
+        with self.release_tracker:
+            # Step 1: Extract plugin list
+            print("\n[1/4] Extracting plugin list...")
+            plugins = self._extract_plugins()
+            print(f"  Found {len(plugins)} plugins to process")
 
-        # Step 3: Process plugin docs
-        print("\n[3/4] Processing plugin documentation...")
-        self._process_plugins(plugins)
+            # Step 2: Process Neovim core docs
+            print("\n[2/4] Processing Neovim core documentation...")
+            self._process_neovim_core()
 
-        # Step 4: Save errors
-        print("\n[4/4] Finalizing...")
-        self.error_logger.save()
+            # Step 3: Process plugin docs
+            print("\n[3/4] Processing plugin documentation...")
+            self._process_plugins(plugins)
+
+            # Step 4: Save errors
+            print("\n[4/4] Finalizing...")
+            self.error_logger.save()
 
         print("\n" + "=" * 60)
         print("✓ Ingestion complete")
         print(f"  Chunks stored in: {self.chunks_dir}")
         if self.error_logger.has_errors():
-            print(f"  Errors logged to: {self.cache_dir / 'errors.json'}")
+            print(f"  Errors logged to: {self.error_logger.log_path}")
         print("=" * 60)
 
     def _extract_plugins(self) -> Dict[str, str]:
@@ -83,8 +93,9 @@ class VimproveIngestion:
                 "ignore": [],
                 "always_include": ["lazy.nvim"],
             }
-            with open(plugins_config_path, "w") as f:
-                json.dump(default_config, f, indent=2)
+            plugins_config_path.write_bytes(
+                orjson.dumps(default_config, option=orjson.OPT_INDENT_2)
+            )
             print(f"  Created default config: {plugins_config_path}")
 
         try:
@@ -105,37 +116,31 @@ class VimproveIngestion:
         output_dir = self.chunks_dir / "neovim-core"
 
         # Check if we should skip (unless force flag)
-        if not self.force and output_dir.exists():
-            existing_files = list(output_dir.glob("*.json"))
-            if existing_files:
-                print("  ℹ  Using cached neovim-core docs (use --force to refresh)")
-                return
+        if not self.force and self._existing_chunk_stems("neovim-core"):
+            print("  ℹ  Using cached neovim-core docs (use --force to refresh)")
+            return
 
         try:
             # Fetch docs
             doc_path = fetch_neovim_docs(self.cache_dir / "neovim")
 
-            # Process each doc file
+            # Process each doc file, chunking across cores and saving from here
             txt_files = list(doc_path.glob("*.txt"))
             print(f"  Processing {len(txt_files)} doc files...")
 
-            for txt_file in txt_files:
-                try:
-                    content = txt_file.read_text(encoding="utf-8")
-                    chunks = chunk_vimdoc(content, "neovim-core")
-
-                    if chunks:
-                        output_path = output_dir / f"{txt_file.stem}.json"
-                        save_chunks(chunks, f"neovim-core/{txt_file.stem}", output_path)
-                        print(f"    ✓ {txt_file.name}: {len(chunks)} chunks")
+            for txt_file, chunks, error in chunk_corpus(
+                ((txt_file, "neovim-core") for txt_file in txt_files),
+                error_logger=self.error_logger,
+            ):
+                if error is not None:
+                    print(f"    ✗ {txt_file.name}: {error}")
+                    continue
 
-                except Exception as e:
-                    self.error_logger.log_error(
-                        source=f"neovim-core/{txt_file.name}",
-                        error_type="processing_failed",
-                        message=str(e),
-                    )
-                    print(f"    ✗ {txt_file.name}: {e}")
+                if chunks:
+                    output_path = output_dir / f"{txt_file.stem}.json"
+                    save_chunks(chunks, f"neovim-core/{txt_file.stem}", output_path)
+                    self._existing_chunk_stems("neovim-core").add(txt_file.stem)
+                    print(f"    ✓ {txt_file.name}: {len(chunks)} chunks")
 
         except Exception as e:
             self.error_logger.log_error(
@@ -146,68 +151,112 @@ class VimproveIngestion:
     def _process_plugins(self, plugins: Dict[str, str]):
         """Fetch and chunk plugin documentation."""
         output_dir = self.chunks_dir / "plugins"
-        fetcher = PluginDocFetcher(self.github_token)
+        fetcher = PluginDocFetcher(
+            self.github_token, max_concurrency=PLUGIN_FETCH_CONCURRENCY
+        )
+        existing = self._existing_chunk_stems("plugins")
 
         processed = 0
         skipped = 0
         failed = 0
 
+        # Decide what to refresh up front, resolving latest versions in bulk
+        if not self.force:
+            self.release_tracker.bulk_refresh(plugins.values())
+
+        to_fetch = []
         for plugin_name, owner_repo in plugins.items():
             owner, repo = owner_repo.split("/")
-            output_path = output_dir / f"{repo}.json"
 
             # Check if we need to update
             needs_update = self.force or self.release_tracker.needs_update(owner, repo)
 
             if not needs_update:
                 # Keep existing chunks
-                if output_path.exists():
+                if repo in existing:
                     print(f"  • {owner_repo} - no changes")
                     skipped += 1
                     continue
 
             print(f"  ⟳ {owner_repo} - fetching...")
+            to_fetch.append(owner_repo)
 
-            try:
-                # Fetch docs
-                docs = fetcher.fetch_plugin_docs(owner, repo)
-
-                # Process all files
-                all_chunks = []
-                for file_info in docs["files"]:
-                    if docs["type"] == "vimdoc":
-                        chunks = chunk_vimdoc(file_info["content"], owner_repo)
-                    else:  # markdown
-                        chunks = chunk_markdown(file_info["content"], owner_repo)
-
-                    all_chunks.extend(chunks)
-
-                # Save chunks
-                if all_chunks:
-                    save_chunks(all_chunks, owner_repo, output_path)
-                    print(
-                        f"    ✓ {len(all_chunks)} chunks from {len(docs['files'])} file(s)"
-                    )
-                    processed += 1
-                else:
-                    print("    ⚠  No chunks generated")
-
-            except Exception as e:
+        # Pass 1: fetch docs concurrently (network bound, concurrency caps GitHub load)
+        fetched = {}
+        for owner_repo, docs in fetcher.fetch_many(to_fetch).items():
+            if isinstance(docs, Exception):
                 failed += 1
-                self.error_logger.log_error(
-                    source=owner_repo,
-                    error_type="plugin_processing_failed",
-                    message=str(e),
-                    details={"owner": owner, "repo": repo},
-                )
-                print(f"    ✗ Error: {e}")
-
-                # Keep old chunks if they exist
-                if output_path.exists():
-                    print("    ℹ  Keeping cached chunks")
+                self._log_plugin_failure(owner_repo, docs)
+            else:
+                fetched[owner_repo] = docs
+
+        # Pass 2: chunk in worker processes (CPU bound), save from this process
+        if fetched:
+            with ProcessPoolExecutor() as pool:
+                futures = {
+                    pool.submit(_chunk_plugin_docs, docs, owner_repo): owner_repo
+                    for owner_repo, docs in fetched.items()
+                }
+                for future in as_completed(futures):
+                    owner_repo = futures[future]
+                    repo = owner_repo.split("/")[1]
+                    try:
+                        all_chunks = future.result()
+                    except Exception as e:
+                        failed += 1
+                        self._log_plugin_failure(owner_repo, e)
+                        continue
+
+                    # Save chunks
+                    if all_chunks:
+                        save_chunks(all_chunks, owner_repo, output_dir / f"{repo}.json")
+                        existing.add(repo)
+                        print(
+                            f"    ✓ {owner_repo}: {len(all_chunks)} chunks from "
+                            f"{len(fetched[owner_repo]['files'])} file(s)"
+                        )
+                        processed += 1
+                    else:
+                        print(f"    ⚠  {owner_repo}: No chunks generated")
 
         print(f"\n  Summary: {processed} processed, {skipped} skipped, {failed} failed")
 
+    def _existing_chunk_stems(self, subdir: str) -> set[str]:
+        """Names of chunk files already under chunks/<subdir>, globbed once per run."""
+        if subdir not in self._existing_chunks:
+            self._existing_chunks[subdir] = {
+                p.stem for p in (self.chunks_dir / subdir).glob("*.json")
+            }
+        return self._existing_chunks[subdir]
+
+    def _log_plugin_failure(self, owner_repo: str, error: Exception):
+        """Record a failed plugin fetch/chunk, keeping any cached chunks."""
+        owner, repo = owner_repo.split("/")
+        self.error_logger.log_error(
+            source=owner_repo,
+            error_type="plugin_processing_failed",
+            message=str(error),
+            details={"owner": owner, "repo": repo},
+        )
+        print(f"    ✗ {owner_repo}: Error: {error}")
+
+        # Keep old chunks if they exist
+        if repo in self._existing_chunk_stems("plugins"):
+            print("    ℹ  Keeping cached chunks")
+
+
+def _chunk_plugin_docs(docs: dict[str, Any], owner_repo: str) -> list[dict[str, Any]]:
+    """Chunk all fetched files for a plugin (top-level so worker processes can run it)."""
+    all_chunks = []
+    for file_info in docs["files"]:
+        if docs["type"] == "vimdoc":
+            chunks = chunk_vimdoc(file_info["content"], owner_repo)
+        else:  # markdown
+            chunks = chunk_markdown(file_info["content"], owner_repo)
+
+        all_chunks.extend(chunks)
+    return all_chunks
+
 
 def main():
     parser = argparse.ArgumentParser(
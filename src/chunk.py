@@ -1,7 +1,21 @@
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-import json
 from pathlib import Path
 
+import orjson
+
+from .error_logger import ErrorLogger
+from .readme_chunker import chunk_markdown_file
+from .vim_doc_chunker import chunk_vimdoc_file
+
+# Chunker for each documentation file type, by suffix
+FILE_CHUNKERS = {
+    ".txt": chunk_vimdoc_file,
+    ".md": chunk_markdown_file,
+}
+
 
 def save_chunks(chunks: list[dict[str, any]], source: str, output_path: Path):
     """Save chunks with metadata wrapper."""
@@ -14,16 +28,48 @@ def save_chunks(chunks: list[dict[str, any]], source: str, output_path: Path):
         "chunks": chunks,
     }
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    # orjson writes UTF-8 directly (no ASCII escaping), matching ensure_ascii=False
+    output_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
 
 
 def load_chunks(chunk_file: Path) -> list[dict[str, any]]:
     """Load chunks from file, handling metadata wrapper."""
-    with open(chunk_file, encoding="utf-8") as f:
-        data = json.load(f)
+    data = orjson.loads(chunk_file.read_bytes())
 
     # Handle both formats (with and without metadata)
     if isinstance(data, list):
         return data
     return data.get("chunks", [])
+
+
+def chunk_corpus(
+    files: Iterable[tuple[Path, str]],
+    max_workers: int | None = None,
+    error_logger: ErrorLogger | None = None,
+) -> Iterator[tuple[Path, list[dict[str, any]], Exception | None]]:
+    """
+    Chunk (path, source) pairs across worker processes, one job per file.
+
+    Yields (path, chunks, error) in input order as results come in; a file
+    that fails for any reason yields no chunks and its exception instead of
+    aborting the run, and is logged to error_logger if one is given.
+    """
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+        jobs = [
+            (path, source, pool.submit(FILE_CHUNKERS[path.suffix], path, source))
+            for path, source in files
+        ]
+        for path, source, future in jobs:
+            # One malformed file must not abort the rest of the corpus
+            try:
+                chunks = future.result()
+            except Exception as e:
+                if error_logger is not None:
+                    error_logger.log_error(
+                        source=f"{source}/{path.name}",
+                        error_type="processing_failed",
+                        message=str(e),
+                    )
+                yield path, [], e
+                continue
+            yield path, chunks, None
@@ -1,6 +1,22 @@
+import os
 import subprocess
 from pathlib import Path
 
+from .error_logger import ErrorLogger
+
+NEOVIM_REPO_URL = "https://github.com/neovim/neovim.git"
+
+
+def _git(*args: str) -> subprocess.CompletedProcess:
+    """Run a git command, failing instead of prompting for credentials."""
+    return subprocess.run(
+        ["git", *args],
+        check=True,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
+    )
+
 
 def fetch_neovim_docs(cache_dir: Path) -> Path:
     """
@@ -13,12 +29,9 @@ def fetch_neovim_docs(cache_dir: Path) -> Path:
     if repo_path.exists():
         print("Updating neovim repo...")
         try:
-            subprocess.run(
-                ["git", "-C", str(repo_path), "pull"],
-                check=True,
-                capture_output=True,
-                text=True,
-            )
+            # Shallow fetch + hard reset: no merge, and the clone stays depth 1
+            _git("-C", str(repo_path), "fetch", "--depth=1", "origin", "HEAD")
+            _git("-C", str(repo_path), "reset", "--hard", "FETCH_HEAD")
             print("✓ Updated neovim docs")
         except subprocess.CalledProcessError as e:
             print(f"Warning: Failed to update neovim repo: {e.stderr}")
@@ -27,28 +40,20 @@ def fetch_neovim_docs(cache_dir: Path) -> Path:
         print("Cloning neovim repo (sparse checkout)...")
         try:
             # Clone with sparse checkout
-            subprocess.run(
-                [
-                    "git",
-                    "clone",
-                    "--depth",
-                    "1",
-                    "--filter=blob:none",
-                    "--sparse",
-                    "https://github.com/neovim/neovim.git",
-                    str(repo_path),
-                ],
-                check=True,
-                capture_output=True,
-                text=True,
+            _git(
+                "clone",
+                "--depth",
+                "1",
+                "--filter=blob:none",
+                "--sparse",
+                NEOVIM_REPO_URL,
+                str(repo_path),
             )
 
-            # Configure sparse checkout for runtime/doc only
-            subprocess.run(
-                ["git", "-C", str(repo_path), "sparse-checkout", "set", "runtime/doc"],
-                check=True,
-                capture_output=True,
-                text=True,
+            # Configure sparse checkout for runtime/doc only (cone mode
+            # matches by directory instead of per-path patterns)
+            _git(
+                "-C", str(repo_path), "sparse-checkout", "set", "--cone", "runtime/doc"
             )
 
             print("✓ Cloned neovim docs")
@@ -61,25 +66,28 @@ def fetch_neovim_docs(cache_dir: Path) -> Path:
     return doc_path
 
 
-def process_neovim_docs(doc_path: Path) -> list[dict[str, any]]:
+def process_neovim_docs(
+    doc_path: Path, error_logger: ErrorLogger | None = None
+) -> list[dict[str, any]]:
     """
-    Process all .txt files in neovim doc directory.
-    Returns list of vimdoc chunks.
+    Process all .txt files in neovim doc directory, one file per worker process.
+    Returns list of vimdoc chunks; files that fail go to error_logger, if given.
     """
-    from .vim_doc_chunker import chunk_vimdoc  # Assuming previous stub
+    from .chunk import chunk_corpus
 
     all_chunks = []
     txt_files = list(doc_path.glob("*.txt"))
 
     print(f"Processing {len(txt_files)} neovim doc files...")
 
-    for txt_file in txt_files:
-        try:
-            content = txt_file.read_text(encoding="utf-8")
-            chunks = chunk_vimdoc(content, "neovim-core")
-            all_chunks.extend(chunks)
-            print(f"  ✓ {txt_file.name}: {len(chunks)} chunks")
-        except Exception as e:
-            print(f"  ✗ {txt_file.name}: {e}")
+    for txt_file, chunks, error in chunk_corpus(
+        ((txt_file, "neovim-core") for txt_file in txt_files),
+        error_logger=error_logger,
+    ):
+        if error is not None:
+            print(f"  ✗ {txt_file.name}: {error}")
+            continue
+        all_chunks.extend(chunks)
+        print(f"  ✓ {txt_file.name}: {len(chunks)} chunks")
 
     return all_chunks
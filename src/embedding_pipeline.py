@@ -4,29 +4,74 @@ Vimprove embedding pipeline.
 Embeds documentation chunks and stores in vector DB.
 
 Usage:
-    python embedding_pipeline.py [--force]
+    python -m src.embedding_pipeline [--force] [--faiss [--fp16]]
+        [--quantized {binary,int8}] [--processes N]
 """
 
 import argparse
-import json
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from itertools import batched, islice
 from pathlib import Path
 from typing import Any
 import hashlib
+import queue
+import threading
 
+import numpy as np
+import orjson
 from sentence_transformers import SentenceTransformer
 import chromadb
 from chromadb.config import Settings
 from tqdm import tqdm
 
+from .encoding import encode_by_length
+
+# Texts per model forward pass, and chunks embedded + added to Chroma per round
+ENCODE_BATCH_SIZE = 128
+STORE_BATCH_SIZE = 5000
+
+# Page size when reading embeddings back out of Chroma to build an index
+FETCH_BATCH_SIZE = 5000
+
+# Threads reading chunk files in _load_chunks, and files each may have read
+# ahead of the encoder
+CHUNK_READ_WORKERS = 16
+CHUNK_READ_AHEAD = 2
+
+# Encoded batches waiting on the Chroma writer thread
+WRITE_QUEUE_SIZE = 2
+
+# Type-specific metadata stored in Chroma, as (chunk key, separator used to
+# join list values); also part of the chunk ID
+TYPE_METADATA_FIELDS = {
+    "vimdoc": (("heading", None), ("tags", ",")),
+    "markdown": (("headings", " > "),),
+}
+BASE_KEYS = ("source", "type")
+
 
 class VimproveEmbedder:
     def __init__(
-        self, cache_dir: Path, model_name: str = "all-MiniLM-L6-v2", force: bool = False
+        self,
+        cache_dir: Path,
+        model_name: str = "all-MiniLM-L6-v2",
+        force: bool = False,
+        build_faiss: bool = False,
+        faiss_fp16: bool = False,
+        quantized: str | None = None,
+        processes: int = 1,
     ):
         self.cache_dir = cache_dir
         self.chunks_dir = cache_dir / "chunks"
         self.vector_db_dir = cache_dir / "vector_db"
         self.force = force
+        self.build_faiss = build_faiss
+        self.faiss_fp16 = faiss_fp16
+        self.quantized = quantized
+        self.processes = processes
 
         print("Loading embedding model...")
         self.model = SentenceTransformer(model_name)
@@ -53,6 +98,9 @@ class VimproveEmbedder:
         )
         print(f"✓ Collection ready ({self.collection.count()} existing chunks)")
 
+        # Largest add Chroma accepts in one call (bounded by SQLite variables)
+        self.store_batch_size = min(STORE_BATCH_SIZE, self.client.get_max_batch_size())
+
     def run(self):
         """Execute embedding pipeline."""
         print("\n" + "=" * 60)
@@ -60,22 +108,21 @@ class VimproveEmbedder:
         print("=" * 60)
 
         # Collect all chunk files
-        print("\n[1/3] Scanning chunk files...")
+        print("\n[1/2] Scanning chunk files...")
         chunk_files = self._collect_chunk_files()
         print(f"  Found {len(chunk_files)} chunk files")
 
-        # Load and prepare chunks
-        print("\n[2/3] Loading chunks...")
-        chunks_to_embed = self._load_chunks(chunk_files)
-        print(f"  Loaded {len(chunks_to_embed)} chunks")
+        # Load, embed and store, streaming chunks into the encoder
+        print("\n[2/2] Embedding chunks...")
+        stored = self._embed_and_store(self._load_chunks(chunk_files))
+        print(f"  Embedded {stored} chunks")
 
-        if not chunks_to_embed:
+        if not stored:
             print("\n✓ All chunks already embedded")
-            return
 
-        # Embed and store
-        print(f"\n[3/3] Embedding {len(chunks_to_embed)} chunks...")
-        self._embed_and_store(chunks_to_embed)
+        # Indexes are rebuilt from the collection either way, so a run with
+        # nothing new to embed can still add a requested index
+        self._build_indexes()
 
         print("\n" + "=" * 60)
         print("✓ Embedding complete")
@@ -83,6 +130,45 @@ class VimproveEmbedder:
         print(f"  Vector DB stored in: {self.vector_db_dir}")
         print("=" * 60)
 
+    def _build_indexes(self):
+        """Rebuild the requested optional indexes from the collection."""
+        if self.build_faiss:
+            from .faiss_index import FaissIndex
+
+            self._build_index(
+                "FAISS", partial(FaissIndex.from_embeddings, fp16=self.faiss_fp16)
+            )
+        if self.quantized:
+            from .quantized_index import QuantizedIndex
+
+            self._build_index(
+                f"{self.quantized} quantized",
+                partial(QuantizedIndex.from_embeddings, precision=self.quantized),
+            )
+
+    def _build_index(self, label: str, build: Callable[[list[str], np.ndarray], Any]):
+        """
+        Read every embedding back out of the collection, index them with
+        build(ids, embeddings) and save the result beside the vector DB.
+        """
+        print(f"\nBuilding {label} index...")
+
+        ids: list[str] = []
+        batches: list[np.ndarray] = []
+        for offset in range(0, self.collection.count(), FETCH_BATCH_SIZE):
+            page = self.collection.get(
+                include=["embeddings"], limit=FETCH_BATCH_SIZE, offset=offset
+            )
+            ids.extend(page["ids"])
+            batches.append(np.asarray(page["embeddings"], dtype=np.float32))
+
+        if not ids:
+            raise ValueError(f"Cannot build {label} index from an empty collection")
+
+        index = build(ids, np.vstack(batches))
+        index.save(self.vector_db_dir)
+        print(f"✓ {label} index ready ({len(index)} vectors)")
+
     def _collect_chunk_files(self) -> list[Path]:
         """Find all chunk JSON files."""
         chunk_files = []
@@ -99,50 +185,73 @@ class VimproveEmbedder:
 
         return sorted(chunk_files)
 
-    def _load_chunks(self, chunk_files: list[Path]) -> list[dict[str, Any]]:
-        """Load chunks from JSON files, skipping already-embedded ones."""
-        chunks_to_embed = []
+    def _load_chunks(self, chunk_files: list[Path]) -> Iterator[dict[str, Any]]:
+        """Yield chunks from JSON files, skipping already-embedded ones."""
+        # One bulk ID fetch instead of a Chroma lookup per chunk
+        existing_ids = (
+            set() if self.force else set(self.collection.get(include=[])["ids"])
+        )
 
-        for chunk_file in tqdm(chunk_files, desc="Loading"):
-            try:
-                with open(chunk_file, encoding="utf-8") as f:
-                    data = json.load(f)
+        # Read and parse files concurrently, consuming them in order. Only a
+        # bounded window is in flight, so parsed files can't pile up in memory
+        # while the encoder is still busy
+        workers = max(1, min(CHUNK_READ_WORKERS, len(chunk_files)))
+        queued = iter(chunk_files)
+        with (
+            ThreadPoolExecutor(max_workers=workers) as pool,
+            tqdm(total=len(chunk_files), desc="Loading chunks") as progress,
+        ):
+            pending: deque[tuple[Path, Future]] = deque(
+                (path, pool.submit(_read_chunk_file, path))
+                for path in islice(queued, workers * CHUNK_READ_AHEAD)
+            )
 
-                # Handle metadata wrapper
-                if isinstance(data, dict) and "chunks" in data:
-                    chunks = data["chunks"]
-                else:
-                    chunks = data
+            while pending:
+                chunk_file, future = pending.popleft()
+                next_file = next(queued, None)
+                if next_file is not None:
+                    pending.append(
+                        (next_file, pool.submit(_read_chunk_file, next_file))
+                    )
+                progress.update()
+
+                try:
+                    chunks = future.result()
+                except Exception as e:
+                    print(f"  ✗ Error loading {chunk_file.name}: {e}")
+                    continue
 
                 for chunk in chunks:
-                    chunk_id = self._generate_chunk_id(chunk)
+                    metadata = self._prepare_metadata(chunk)
+                    chunk_id = self._generate_chunk_id(chunk, metadata=metadata)
 
                     # Skip if already in DB (unless force mode)
-                    if not self.force:
-                        existing = self.collection.get(ids=[chunk_id])
-                        if existing["ids"]:
-                            continue
-
-                    chunks_to_embed.append(chunk)
-
-            except Exception as e:
-                print(f"  ✗ Error loading {chunk_file.name}: {e}")
-
-        return chunks_to_embed
-
-    def _generate_chunk_id(self, chunk: dict[str, Any], counter: int = 0) -> str:
-        """Generate deterministic ID for chunk based on content and metadata."""
-        parts = [chunk["source"], chunk["type"], chunk["text"]]
-
-        # Add type-specific metadata for uniqueness
-        if chunk["type"] == "vimdoc":
-            if chunk.get("heading"):
-                parts.append(chunk["heading"])
-            if chunk.get("tags"):
-                parts.append(",".join(chunk["tags"]))
-        elif chunk["type"] == "markdown":
-            if chunk.get("headings"):
-                parts.append(" > ".join(chunk["headings"]))
+                    if chunk_id in existing_ids:
+                        continue
+
+                    # Reused by _embed_and_store
+                    chunk["_id"] = chunk_id
+                    chunk["_meta"] = metadata
+                    yield chunk
+
+    def _generate_chunk_id(
+        self,
+        chunk: dict[str, Any],
+        counter: int = 0,
+        metadata: dict[str, Any] | None = None,
+    ) -> str:
+        """
+        Generate deterministic ID for chunk based on content and metadata.
+
+        IDs are what later runs use to skip already-embedded chunks, so
+        changing this scheme re-embeds (and duplicates) every existing DB.
+        """
+        if metadata is None:
+            metadata = self._prepare_metadata(chunk)
+
+        # source, type, text, then the type-specific metadata for uniqueness
+        parts = [metadata["source"], metadata["type"], chunk["text"]]
+        parts.extend(value for key, value in metadata.items() if key not in BASE_KEYS)
 
         # Add counter if > 0 (for handling true duplicates within batch)
         if counter > 0:
@@ -151,64 +260,130 @@ class VimproveEmbedder:
         content = "|||".join(parts)
         return hashlib.sha256(content.encode("utf-8")).hexdigest()
 
-    def _embed_and_store(self, chunks: list[dict[str, any]]):
-        """Embed chunks and store in Chroma."""
-        batch_size = 32
-
-        for i in tqdm(range(0, len(chunks), batch_size), desc="Embedding"):
-            batch = chunks[i : i + batch_size]
+    def _embed_and_store(self, chunks: Iterable[dict[str, Any]]) -> int:
+        """
+        Embed chunks and store in Chroma, consuming them in batches as they
+        are loaded. A writer thread adds each batch to Chroma while the next
+        one is encoded. Returns the number of chunks stored.
+        """
+        seen_ids = set()
+        counter_map = {}
+
+        writes = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+        writer = _ChromaWriter(self.collection, writes)
+        writer.start()
+
+        pool = None
+        if self.processes > 1:
+            pool = self.model.start_multi_process_pool(["cpu"] * self.processes)
+
+        try:
+            for batch in batched(chunks, self.store_batch_size):
+                # Stop encoding if the writer has already failed
+                if writer.error is not None:
+                    break
+
+                texts = [chunk["text"] for chunk in batch]
+                metadatas = [
+                    chunk.get("_meta") or self._prepare_metadata(chunk)
+                    for chunk in batch
+                ]
+
+                # Prepare IDs with duplicate handling
+                ids = []
+                for chunk, metadata in zip(batch, metadatas):
+                    base_id = chunk.get("_id") or self._generate_chunk_id(
+                        chunk, metadata=metadata
+                    )
+
+                    # Handle true duplicates (same content and metadata)
+                    if base_id in seen_ids:
+                        counter_map[base_id] = counter_map.get(base_id, 0) + 1
+                        chunk_id = self._generate_chunk_id(
+                            chunk, counter_map[base_id], metadata
+                        )
+                    else:
+                        chunk_id = base_id
+
+                    ids.append(chunk_id)
+                    seen_ids.add(chunk_id)
+
+                # One encode call per token-length bucket of the batch, so
+                # forward passes pad only to similar lengths
+                embeddings = encode_by_length(
+                    self.model,
+                    texts,
+                    batch_size=ENCODE_BATCH_SIZE,
+                    show_progress_bar=False,
+                    normalize_embeddings=True,
+                    pool=pool,
+                )
+
+                # Hand off to the writer (blocks if it's WRITE_QUEUE_SIZE behind)
+                writes.put((ids, embeddings, texts, metadatas))
+        finally:
+            writes.put(None)
+            writer.join()
+            if pool is not None:
+                self.model.stop_multi_process_pool(pool)
+
+        if writer.error is not None:
+            raise writer.error
+
+        return writer.stored
 
-            # Extract texts for embedding
-            texts = [chunk["text"] for chunk in batch]
+    def _prepare_metadata(self, chunk: dict[str, Any]) -> dict[str, Any]:
+        """Prepare chunk metadata for Chroma storage."""
+        metadata = {"source": chunk["source"], "type": chunk["type"]}
 
-            # Generate embeddings
-            embeddings = self.model.encode(
-                texts, show_progress_bar=False, convert_to_numpy=True
-            ).tolist()
+        # Add type-specific metadata
+        for key, separator in TYPE_METADATA_FIELDS.get(chunk["type"], ()):
+            value = chunk.get(key)
+            if value:
+                # Chroma doesn't support list metadata, join lists as strings
+                metadata[key] = separator.join(value) if separator else value
 
-            # Prepare IDs with duplicate handling
-            ids = []
-            seen_ids = set()
-            counter_map = {}
+        return metadata
 
-            for chunk in batch:
-                base_id = self._generate_chunk_id(chunk, 0)
 
-                # Handle duplicates within batch
-                if base_id in seen_ids:
-                    counter_map[base_id] = counter_map.get(base_id, 0) + 1
-                    chunk_id = self._generate_chunk_id(chunk, counter_map[base_id])
-                else:
-                    chunk_id = base_id
+class _ChromaWriter(threading.Thread):
+    """Drains (ids, embeddings, documents, metadatas) batches into Chroma."""
 
-                ids.append(chunk_id)
-                seen_ids.add(chunk_id)
+    def __init__(self, collection, writes: queue.Queue):
+        super().__init__(daemon=True)
+        self.collection = collection
+        self.writes = writes
+        self.stored = 0
+        self.error: Exception | None = None
 
-            metadatas = [self._prepare_metadata(chunk) for chunk in batch]
+    def run(self):
+        while (item := self.writes.get()) is not None:
+            # After a failure keep draining so the producer never blocks
+            if self.error is not None:
+                continue
 
-            # Store in Chroma
-            self.collection.add(
-                ids=ids, embeddings=embeddings, documents=texts, metadatas=metadatas
-            )
+            ids, embeddings, documents, metadatas = item
+            try:
+                # The ndarray goes in as-is, no float lists
+                self.collection.add(
+                    ids=ids,
+                    embeddings=embeddings,
+                    documents=documents,
+                    metadatas=metadatas,
+                )
+                self.stored += len(ids)
+            except Exception as e:
+                self.error = e
 
-    def _prepare_metadata(self, chunk: dict[str, Any]) -> dict[str, Any]:
-        """Prepare chunk metadata for Chroma storage."""
-        metadata = {"source": chunk["source"], "type": chunk["type"]}
 
-        # Add type-specific metadata
-        if chunk["type"] == "vimdoc":
-            if chunk.get("heading"):
-                metadata["heading"] = chunk["heading"]
-            if chunk.get("tags"):
-                # Chroma doesn't support list metadata, join as string
-                metadata["tags"] = ",".join(chunk["tags"])
-
-        elif chunk["type"] == "markdown":
-            if chunk.get("headings"):
-                # Store as hierarchical string
-                metadata["headings"] = " > ".join(chunk["headings"])
+def _read_chunk_file(path: Path) -> list[dict[str, Any]]:
+    """Parse a chunk JSON file into its list of chunks."""
+    data = orjson.loads(path.read_bytes())
 
-        return metadata
+    # Handle metadata wrapper
+    if isinstance(data, dict) and "chunks" in data:
+        return data["chunks"]
+    return data
 
 
 def main():
@@ -230,11 +405,39 @@ def main():
     parser.add_argument(
         "--force", action="store_true", help="Force re-embed all chunks"
     )
+    parser.add_argument(
+        "--faiss",
+        action="store_true",
+        help="Also build a FAISS index for the faiss retrieval backend",
+    )
+    parser.add_argument(
+        "--fp16",
+        action="store_true",
+        help="Store FAISS index vectors as float16 (half the size)",
+    )
+    parser.add_argument(
+        "--quantized",
+        choices=("binary", "int8"),
+        default=None,
+        help="Also build a binary or int8 index for the quantized retrieval backend",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        help="Encode with this many CPU worker processes (default: 1)",
+    )
 
     args = parser.parse_args()
 
     embedder = VimproveEmbedder(
-        cache_dir=args.cache_dir, model_name=args.model, force=args.force
+        cache_dir=args.cache_dir,
+        model_name=args.model,
+        force=args.force,
+        build_faiss=args.faiss,
+        faiss_fp16=args.fp16,
+        quantized=args.quantized,
+        processes=args.processes,
     )
 
     try:
@@ -0,0 +1,48 @@
+"""
+Length-bucketed encoding for SentenceTransformer models.
+
+SentenceTransformer.encode sorts its input by character count and pads each
+batch to its longest member. Character count is a loose proxy for token count
+(code and vimdoc markup tokenize far denser than prose), so mixed batches
+still pad short texts to long ones. Grouping texts by token count first and
+encoding each group separately keeps every batch within one length bucket.
+"""
+
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+# Upper token-count bound of each bucket; longer texts share a final bucket
+LENGTH_BUCKETS = (32, 64, 128, 256, 512)
+
+
+def encode_by_length(
+    model: SentenceTransformer,
+    texts: list[str],
+    buckets: tuple[int, ...] = LENGTH_BUCKETS,
+    **encode_kwargs,
+) -> np.ndarray:
+    """
+    Encode texts one token-length bucket at a time, returning embeddings in
+    input order. Extra keyword arguments go to model.encode.
+    """
+    # Lengths only pick a bucket, so anything past the last bound can truncate
+    tokens = model.tokenizer(
+        texts, add_special_tokens=False, truncation=True, max_length=buckets[-1] + 1
+    )
+    bucket_of = np.searchsorted(buckets, [len(ids) for ids in tokens["input_ids"]])
+
+    groups = np.unique(bucket_of)
+    if len(groups) <= 1:
+        return model.encode(texts, convert_to_numpy=True, **encode_kwargs)
+
+    embeddings = None
+    for group in groups:
+        rows = np.flatnonzero(bucket_of == group)
+        part = model.encode(
+            [texts[i] for i in rows], convert_to_numpy=True, **encode_kwargs
+        )
+        if embeddings is None:
+            embeddings = np.empty((len(texts), part.shape[1]), dtype=part.dtype)
+        embeddings[rows] = part
+
+    return embeddings
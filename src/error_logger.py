@@ -1,9 +1,17 @@
 from datetime import datetime
 from pathlib import Path
-import json
+from typing import Any
+
+import orjson
 
 
 class ErrorLogger:
+    """
+    Append-only JSON Lines error log: one object per line, written as each
+    error is logged, so history never has to be re-read and an interrupted
+    run keeps everything logged so far.
+    """
+
     def __init__(self, log_path: Path):
         self.log_path = log_path
         self.errors = []
@@ -13,40 +21,36 @@ class ErrorLogger:
         source: str,
         error_type: str,
         message: str,
-        details: dict[str, any] | None = None,
+        details: dict[str, Any] | None = None,
     ):
         """Log an error that occurred during processing."""
-        self.errors.append(
-            {
-                "timestamp": datetime.utcnow().isoformat() + "Z",
-                "source": source,
-                "error_type": error_type,
-                "message": message,
-                "details": details or {},
-            }
-        )
-
-    def save(self):
-        """Save errors to JSON file."""
-        if not self.errors:
-            # Don't create file if no errors
-            return
-
+        entry = {
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "source": source,
+            "error_type": error_type,
+            "message": message,
+            "details": details or {},
+        }
+        self.errors.append(entry)
+
+        # Don't create file until there's an error; opening per entry means
+        # no handle outlives the call
         self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.log_path, "ab") as f:
+            f.write(orjson.dumps(entry) + b"\n")
 
-        # Load existing errors if file exists
-        existing_errors = []
-        if self.log_path.exists():
-            with open(self.log_path, encoding="utf-8") as f:
-                existing_errors = json.load(f)
-
-        # Append new errors
-        all_errors = existing_errors + self.errors
-
-        with open(self.log_path, "w", encoding="utf-8") as f:
-            json.dump(all_errors, f, indent=2, ensure_ascii=False)
-
-        print(f"\n⚠️  Logged {len(self.errors)} errors to {self.log_path}")
+    def save(self):
+        """Report how many errors were logged (entries are already written)."""
+        if self.errors:
+            print(f"\n⚠️  Logged {len(self.errors)} errors to {self.log_path}")
 
     def has_errors(self) -> bool:
         return len(self.errors) > 0
+
+
+def read_errors(log_path: Path) -> list[dict[str, Any]]:
+    """Load every entry from a JSON Lines error log."""
+    if not log_path.exists():
+        return []
+    with open(log_path, "rb") as f:
+        return [orjson.loads(line) for line in f if line.strip()]
@@ -0,0 +1,90 @@
+"""
+Optional FAISS index over the embeddings stored in Chroma.
+
+Chroma stays the source of truth (documents, metadata, filtering); this index
+only maps a query embedding to the nearest chunk IDs. Exact search
+(IndexFlatL2) is used for small corpora, HNSW above HNSW_THRESHOLD vectors.
+Distances are squared L2, the same metric as the Chroma collection.
+
+With fp16=True vectors are stored as float16 scalar-quantized codes, halving
+index size and memory traffic per distance computation.
+"""
+
+from pathlib import Path
+
+import faiss
+import numpy as np
+import orjson
+
+INDEX_FILE = "faiss.index"
+IDS_FILE = "faiss_ids.json"
+
+# Switch from exact to approximate search above this many vectors
+HNSW_THRESHOLD = 100_000
+HNSW_M = 32
+
+
+class FaissIndex:
+    def __init__(self, index: faiss.Index, ids: list[str]):
+        self.index = index
+        self.ids = ids
+
+    @classmethod
+    def from_embeddings(
+        cls, ids: list[str], embeddings: np.ndarray, fp16: bool = False
+    ) -> "FaissIndex":
+        """Index float embeddings (one row per ID)."""
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        dim = embeddings.shape[1]
+
+        fp16_codes = faiss.ScalarQuantizer.QT_fp16
+        if len(ids) >= HNSW_THRESHOLD:
+            if fp16:
+                index = faiss.IndexHNSWSQ(dim, fp16_codes, HNSW_M)
+            else:
+                index = faiss.IndexHNSWFlat(dim, HNSW_M)
+        elif fp16:
+            index = faiss.IndexScalarQuantizer(dim, fp16_codes, faiss.METRIC_L2)
+        else:
+            index = faiss.IndexFlatL2(dim)
+        index.add(embeddings)
+
+        return cls(index, list(ids))
+
+    @classmethod
+    def load(cls, index_dir: Path) -> "FaissIndex":
+        """Load a previously saved index."""
+        index = faiss.read_index(str(index_dir / INDEX_FILE))
+        ids = orjson.loads((index_dir / IDS_FILE).read_bytes())
+        return cls(index, ids)
+
+    def save(self, index_dir: Path):
+        """Persist index and position -> chunk ID mapping."""
+        index_dir.mkdir(parents=True, exist_ok=True)
+        faiss.write_index(self.index, str(index_dir / INDEX_FILE))
+        (index_dir / IDS_FILE).write_bytes(orjson.dumps(self.ids))
+
+    def search(
+        self, query_embeddings: np.ndarray, n_results: int
+    ) -> tuple[list[list[str]], list[list[float]]]:
+        """
+        Find nearest chunks for each query embedding.
+
+        Returns:
+            (ids, distances), one list per query, nearest first
+        """
+        queries = np.ascontiguousarray(query_embeddings, dtype=np.float32)
+        distances, positions = self.index.search(queries, n_results)
+
+        all_ids = []
+        all_distances = []
+        for row_positions, row_distances in zip(positions, distances):
+            # FAISS pads with -1 when fewer than n_results vectors exist
+            hits = [(p, d) for p, d in zip(row_positions, row_distances) if p >= 0]
+            all_ids.append([self.ids[p] for p, _ in hits])
+            all_distances.append([float(d) for _, d in hits])
+
+        return all_ids, all_distances
+
+    def __len__(self) -> int:
+        return self.index.ntotal
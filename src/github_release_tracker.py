@@ -1,33 +1,73 @@
-import json
-import httpx
+import time
+from collections.abc import Iterable
 from pathlib import Path
+from typing import Self
+
+import httpx
+import orjson
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+
+# Repositories per GraphQL request (keeps each query well under node limits)
+GRAPHQL_BATCH_SIZE = 50
+
+# Transient GitHub responses retried with exponential backoff
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
+
+
+def backoff_delay(attempt: int) -> float:
+    """Seconds to wait before retry number attempt (0-based)."""
+    return BACKOFF_FACTOR * 2**attempt
 
 
 class ReleaseTracker:
     def __init__(self, cache_file: Path, github_token: str) -> None:
         self.cache_file = cache_file
-        self.headers = {"Authorization": f"token {github_token}"}
+        self.headers = {
+            "Authorization": f"token {github_token}",
+            "Accept": "application/vnd.github+json",
+        }
+        # One pooled client, so release checks reuse the same TLS connection
+        # (httpx negotiates gzip by default); transport retries cover
+        # connection errors
+        self.client = httpx.Client(
+            headers=self.headers,
+            timeout=30.0,
+            transport=httpx.HTTPTransport(http2=True, retries=MAX_RETRIES),
+        )
         self.cache = self._load_cache()
+        # Latest versions prefetched by bulk_refresh, keyed by owner/repo
+        self.latest: dict[str, str | None] = {}
 
     def _load_cache(self) -> dict[str, str]:
         if self.cache_file.exists():
-            with open(self.cache_file) as f:
-                return json.load(f)
+            return orjson.loads(self.cache_file.read_bytes())
         return {}
 
     def _save_cache(self):
-        with open(self.cache_file, "w") as f:
-            json.dump(self.cache, f, indent=2)
+        self.cache_file.write_bytes(
+            orjson.dumps(self.cache, option=orjson.OPT_INDENT_2)
+        )
+
+    def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request, retrying transient GitHub errors."""
+        for attempt in range(MAX_RETRIES + 1):
+            resp = self.client.request(method, url, **kwargs)
+            if resp.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                return resp
+            time.sleep(backoff_delay(attempt))
 
     def get_latest_release(self, owner: str, repo: str) -> str | None:
         """Fetch latest release tag, return None if no releleases"""
         url = f"https://api.github.com/repos/{owner}/{repo}/releases/latest"
-        resp = httpx.get(url, headers=self.headers)
+        resp = self._request("GET", url)
 
         if resp.status_code == 404:
             # No releases, fall back to latest commit SHA
             url = f"https://api.github.com/repos/{owner}/{repo}/commits/HEAD"
-            resp = httpx.get(url, headers=self.headers)
+            resp = self._request("GET", url)
             if resp.status_code == 200:
                 return resp.json()["sha"][:7]  # Short SHA
             return None
@@ -36,9 +76,68 @@ class ReleaseTracker:
 
         return None
 
+    def bulk_refresh(self, owner_repos: Iterable[str]):
+        """
+        Prefetch latest release tags (or HEAD SHAs) for many repos via GraphQL,
+        so needs_update() doesn't make REST calls per plugin.
+        """
+        owner_repos = list(dict.fromkeys(owner_repos))
+
+        for start in range(0, len(owner_repos), GRAPHQL_BATCH_SIZE):
+            batch = owner_repos[start : start + GRAPHQL_BATCH_SIZE]
+            try:
+                self.latest.update(self._query_latest(batch))
+            except (httpx.HTTPError, KeyError, ValueError) as e:
+                # Leave these un-prefetched; needs_update falls back to REST
+                print(f"  Warning: GraphQL release lookup failed: {e}")
+
+    def _query_latest(self, owner_repos: list[str]) -> dict[str, str | None]:
+        """Resolve latest versions for one batch of repos in a single request."""
+        params = []
+        fields = []
+        variables = {}
+        for i, owner_repo in enumerate(owner_repos):
+            owner, repo = owner_repo.split("/")
+            params.append(f"$owner{i}: String!, $name{i}: String!")
+            fields.append(
+                f"repo{i}: repository(owner: $owner{i}, name: $name{i}) {{"
+                " latestRelease { tagName }"
+                " defaultBranchRef { target { oid } } }"
+            )
+            variables[f"owner{i}"] = owner
+            variables[f"name{i}"] = repo
+
+        query = f"query({', '.join(params)}) {{ {' '.join(fields)} }}"
+        resp = self._request(
+            "POST", GRAPHQL_URL, json={"query": query, "variables": variables}
+        )
+        resp.raise_for_status()
+        payload = resp.json()
+        data = payload.get("data")
+        if data is None:
+            raise ValueError(payload.get("errors", "no data in response"))
+
+        latest = {}
+        for i, owner_repo in enumerate(owner_repos):
+            node = data.get(f"repo{i}")
+            if node is None:
+                # Missing or inaccessible repo, can't determine version
+                latest[owner_repo] = None
+            elif node["latestRelease"]:
+                latest[owner_repo] = node["latestRelease"]["tagName"]
+            elif node["defaultBranchRef"]:
+                # No releases, fall back to latest commit SHA
+                latest[owner_repo] = node["defaultBranchRef"]["target"]["oid"][:7]
+            else:
+                latest[owner_repo] = None
+        return latest
+
     def needs_update(self, owner: str, repo: str) -> bool:
         key = f"{owner}/{repo}"
-        latest = self.get_latest_release(owner, repo)
+        if key in self.latest:
+            latest = self.latest[key]
+        else:
+            latest = self.get_latest_release(owner, repo)
 
         if latest is None:
             return False  # Skip if can't determine version
@@ -51,3 +150,13 @@ class ReleaseTracker:
             return True
 
         return False
+
+    def close(self):
+        """Close the pooled HTTP client."""
+        self.client.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
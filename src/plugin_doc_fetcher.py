@@ -1,13 +1,55 @@
-import requests
+import asyncio
 import time
 
+import httpx
+
+from .github_release_tracker import MAX_RETRIES, RETRY_STATUSES, backoff_delay
+
+# Pause once GitHub reports fewer API calls than this left in the window
+RATE_LIMIT_FLOOR = 10
+
 
 class PluginDocFetcher:
-    def __init__(self, github_token: str, rate_limit_delay: float = 0.1):
+    def __init__(self, github_token: str, max_concurrency: int = 8):
         self.headers = {"Authorization": f"token {github_token}"}
-        self.rate_limit_delay = rate_limit_delay
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
+        self.max_concurrency = max_concurrency
+        self._client: httpx.AsyncClient | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+    def fetch_many(
+        self, owner_repos: list[str]
+    ) -> dict[str, dict[str, any] | Exception]:
+        """
+        Fetch docs for several plugins concurrently.
+        Returns {owner_repo: docs}, with the raised exception as the value for
+        plugins that failed.
+        """
+        return asyncio.run(self._fetch_many(owner_repos))
+
+    async def _fetch_many(
+        self, owner_repos: list[str]
+    ) -> dict[str, dict[str, any] | Exception]:
+        async with httpx.AsyncClient(
+            headers=self.headers,
+            follow_redirects=True,
+            timeout=30.0,
+            transport=httpx.AsyncHTTPTransport(http2=True, retries=MAX_RETRIES),
+        ) as client:
+            self._client = client
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            try:
+                results = await asyncio.gather(
+                    *[
+                        self._fetch_plugin_docs(*owner_repo.split("/"))
+                        for owner_repo in owner_repos
+                    ],
+                    return_exceptions=True,
+                )
+            finally:
+                self._client = None
+                self._semaphore = None
+
+        return dict(zip(owner_repos, results))
 
     def fetch_plugin_docs(self, owner: str, repo: str) -> dict[str, any]:
         """
@@ -18,24 +60,67 @@ class PluginDocFetcher:
         }
         Raises exception if neither help files nor README found.
         """
+        docs = self.fetch_many([f"{owner}/{repo}"])[f"{owner}/{repo}"]
+        if isinstance(docs, Exception):
+            raise docs
+        return docs
+
+    async def _fetch_plugin_docs(self, owner: str, repo: str) -> dict[str, any]:
+        """
+        Async body of fetch_plugin_docs. Uses the client and semaphore that
+        _fetch_many sets up, so it only runs through fetch_many.
+        """
         # Try help files first
-        help_files = self._fetch_help_files(owner, repo)
+        help_files = await self._fetch_help_files(owner, repo)
         if help_files:
             return {"type": "vimdoc", "files": help_files}
 
         # Fallback to README
-        readme = self._fetch_readme(owner, repo)
+        readme = await self._fetch_readme(owner, repo)
         if readme:
             return {"type": "markdown", "files": [readme]}
 
         raise Exception(f"No documentation found for {owner}/{repo}")
 
-    def _fetch_help_files(self, owner: str, repo: str) -> list[dict[str, str]] | None:
+    async def _get(self, url: str) -> httpx.Response:
+        """
+        GET with bounded concurrency, retrying transient errors and backing off
+        when the rate limit runs low.
+        """
+        while True:
+            async with self._semaphore:
+                for attempt in range(MAX_RETRIES + 1):
+                    resp = await self._client.get(url)
+                    if resp.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                        break
+                    await asyncio.sleep(backoff_delay(attempt))
+
+                remaining = resp.headers.get("X-RateLimit-Remaining")
+                reset = resp.headers.get("X-RateLimit-Reset")
+                if (
+                    remaining is None
+                    or reset is None
+                    or int(remaining) >= RATE_LIMIT_FLOOR
+                ):
+                    return resp
+                wait = max(0.0, int(reset) - time.time())
+
+            # Sleep without holding a slot, so other fetches aren't blocked
+            # behind this one
+            print(f"  Rate limit nearly exhausted, waiting {wait:.0f}s")
+            await asyncio.sleep(wait)
+
+            # Only a request refused for the exhausted limit is worth resending
+            if int(remaining) > 0 or resp.status_code not in (403, 429):
+                return resp
+
+    async def _fetch_help_files(
+        self, owner: str, repo: str
+    ) -> list[dict[str, str]] | None:
         """Fetch .txt files from doc/ directory."""
         try:
             url = f"https://api.github.com/repos/{owner}/{repo}/contents/doc"
-            resp = self.session.get(url)
-            time.sleep(self.rate_limit_delay)
+            resp = await self._get(url)
 
             if resp.status_code == 404:
                 return None
@@ -48,26 +133,26 @@ class PluginDocFetcher:
             if not txt_files:
                 return None
 
+            file_resps = await asyncio.gather(
+                *[self._get(f["download_url"]) for f in txt_files]
+            )
+
             result = []
-            for f in txt_files:
-                file_resp = self.session.get(f["download_url"])
-                time.sleep(self.rate_limit_delay)
+            for f, file_resp in zip(txt_files, file_resps):
                 file_resp.raise_for_status()
-
                 result.append({"name": f["name"], "content": file_resp.text})
 
             return result
 
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             print(f"  Warning: Error fetching help files for {owner}/{repo}: {e}")
             return None
 
-    def _fetch_readme(self, owner: str, repo: str) -> dict[str, str] | None:
+    async def _fetch_readme(self, owner: str, repo: str) -> dict[str, str] | None:
         """Fetch README via GitHub API."""
         try:
             url = f"https://api.github.com/repos/{owner}/{repo}/readme"
-            resp = self.session.get(url)
-            time.sleep(self.rate_limit_delay)
+            resp = await self._get(url)
 
             if resp.status_code == 404:
                 return None
@@ -75,13 +160,12 @@ class PluginDocFetcher:
             resp.raise_for_status()
 
             readme_data = resp.json()
-            readme_resp = self.session.get(readme_data["download_url"])
-            time.sleep(self.rate_limit_delay)
+            readme_resp = await self._get(readme_data["download_url"])
             readme_resp.raise_for_status()
 
             return {"name": readme_data["name"], "content": readme_resp.text}
 
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             print(f"  Warning: Error fetching README for {owner}/{repo}: {e}")
             return None
 
@@ -100,6 +184,10 @@ def process_plugin_docs(
     fetcher = PluginDocFetcher(github_token)
     all_chunks = []
 
+    # Check for updates first, resolving latest versions in one bulk lookup
+    release_tracker.bulk_refresh(plugins.values())
+
+    to_fetch = []
     for plugin_name, owner_repo in plugins.items():
         owner, repo = owner_repo.split("/")
 
@@ -109,21 +197,20 @@ def process_plugin_docs(
             continue
 
         print(f"  ✓ {owner_repo} - fetching docs")
+        to_fetch.append(owner_repo)
 
-        try:
-            docs = fetcher.fetch_plugin_docs(owner, repo)
-
-            for file_info in docs["files"]:
-                if docs["type"] == "vimdoc":
-                    chunks = chunk_vimdoc(file_info["content"], owner_repo)
-                else:  # markdown
-                    chunks = chunk_markdown(file_info["content"], owner_repo)
+    for owner_repo, docs in fetcher.fetch_many(to_fetch).items():
+        if isinstance(docs, Exception):
+            print(f"  ✗ {owner_repo} - error: {docs}")
+            continue
 
-                all_chunks.extend(chunks)
-                print(f"    {file_info['name']}: {len(chunks)} chunks")
+        for file_info in docs["files"]:
+            if docs["type"] == "vimdoc":
+                chunks = chunk_vimdoc(file_info["content"], owner_repo)
+            else:  # markdown
+                chunks = chunk_markdown(file_info["content"], owner_repo)
 
-        except Exception as e:
-            print(f"  ✗ {owner_repo} - error: {e}")
-            continue
+            all_chunks.extend(chunks)
+            print(f"    {file_info['name']}: {len(chunks)} chunks")
 
     return all_chunks
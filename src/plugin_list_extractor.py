@@ -5,9 +5,16 @@ not getting catppuccin
 """
 
 import json
+import mmap
+import os
 import re
 from pathlib import Path
 
+import orjson
+
+# 'owner/repo' in single or double quotes; matched on raw bytes to skip decoding
+OWNER_REPO_RE = re.compile(rb"['\"]([a-zA-Z0-9_-]+/[a-zA-Z0-9_.-]+)['\"]")
+
 
 def extract_plugin_list(
     lazy_lock_path: Path, lazy_specs_dir: Path, config_path: Path
@@ -27,24 +34,29 @@ def extract_plugin_list(
     # step 0: Load config
     config = {"overrides": {}, "ignore": [], "always_include": []}
     if config_path.exists():
-        with open(config_path) as f:
-            config.update(json.load(f))
+        config.update(orjson.loads(config_path.read_bytes()))
 
     # step 1: get plugs from lock
-    with open(lazy_lock_path) as f:
-        lock_data = json.load(f)
+    lock_data = orjson.loads(lazy_lock_path.read_bytes())
 
     plugin_names = set(lock_data.keys())
 
     plugin_names = plugin_names - set(config["ignore"])
 
     # step 2: extract all owner/repo from specs
-    owner_repos = []
-    for lua_file in lazy_specs_dir.rglob("*.lua"):
-        content = lua_file.read_text()
-        # match 'owner/repo' regardless of quotes
-        matches = re.findall(r"['\"]([a-zA-Z0-9_-]+/[a-zA-Z0-9_.-]+)['\"]", content)
-        owner_repos.extend(matches)
+    # Deduplicated in first-seen order (a dict, not a set, so "first
+    # occurrence wins" below stays deterministic)
+    owner_repos: dict[str, None] = {}
+    for lua_file in sorted(lazy_specs_dir.rglob("*.lua")):
+        owner_repos.update(dict.fromkeys(_scan_owner_repos(lua_file)))
+
+    # Index by repo name, exact and normalized (first occurrence wins)
+    by_repo_name = {}
+    by_normalized = {}
+    for owner_repo in owner_repos:
+        repo_part = owner_repo.split("/")[-1]
+        by_repo_name.setdefault(repo_part, owner_repo)
+        by_normalized.setdefault(_normalize(repo_part), owner_repo)
 
     # step 3: match plug names to owner/repo
     result = {}
@@ -55,25 +67,13 @@ def extract_plugin_list(
             result[plugin_name] = config["overrides"][plugin_name]
             continue
 
-        exact = [r for r in owner_repos if r.endswith(f"/{plugin_name}")]
-        if exact:
-            result[plugin_name] = exact[0]
+        if plugin_name in by_repo_name:
+            result[plugin_name] = by_repo_name[plugin_name]
             continue
 
-        normalized = (
-            plugin_name.lower().replace(".nvim", "").replace("-", "").replace("_", "")
-        )
-        for repo in owner_repos:
-            repo_part = (
-                repo.split("/")[-1]
-                .lower()
-                .replace(".nvim", "")
-                .replace("-", "")
-                .replace("_", "")
-            )
-            if repo_part == normalized:
-                result[plugin_name] = repo
-                break
+        normalized = _normalize(plugin_name)
+        if normalized in by_normalized:
+            result[plugin_name] = by_normalized[normalized]
 
     # Step 4: Add always_include plugins
     for plugin_name in config["always_include"]:
@@ -86,9 +86,8 @@ def extract_plugin_list(
                 result[plugin_name] = "folke/lazy.nvim"
             else:
                 # Try to find in owner_repos
-                matches = [r for r in owner_repos if r.endswith(f"/{plugin_name}")]
-                if matches:
-                    result[plugin_name] = matches[0]
+                if plugin_name in by_repo_name:
+                    result[plugin_name] = by_repo_name[plugin_name]
 
     unmatched = plugin_names - set(result.keys())
     if unmatched:
@@ -97,6 +96,21 @@ def extract_plugin_list(
     return result
 
 
+def _normalize(name: str) -> str:
+    """Loose plugin name for matching, e.g. 'LuaSnip' ~ 'lua-snip'."""
+    return name.lower().replace(".nvim", "").replace("-", "").replace("_", "")
+
+
+def _scan_owner_repos(lua_file: Path) -> list[str]:
+    """Find quoted owner/repo strings in a spec file, searched via mmap."""
+    with open(lua_file, "rb") as f:
+        # mmap can't map an empty file
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return [m.decode("ascii") for m in OWNER_REPO_RE.findall(mm)]
+
+
 if __name__ == "__main__":
     plugins = extract_plugin_list(
         Path("~/.config/nvim/lazy-lock.json").expanduser(),
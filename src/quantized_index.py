@@ -0,0 +1,144 @@
+"""
+Optional quantized index over the embeddings stored in Chroma.
+
+Like the FAISS index, Chroma stays the source of truth; this index only keeps
+a compact copy of every embedding for a fast first pass:
+
+- "binary": one sign bit per dimension, packed 8 per byte (32x smaller than
+  float32), ranked by Hamming distance
+- "int8": one byte per dimension, bucketed between the corpus' per-dimension
+  min and max (4x smaller), ranked by squared L2 distance between codes
+
+The first pass returns RERANK_FACTOR * n_results candidates, which the
+retriever rescores exactly against their float32 embeddings from Chroma.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import orjson
+
+INDEX_FILE = "quantized.npz"
+IDS_FILE = "quantized_ids.json"
+
+PRECISIONS = ("binary", "int8")
+
+# Candidates kept per requested result for the float32 rerank
+RERANK_FACTOR = 4
+
+# Rows scored at a time, bounding temporary memory on large corpora
+SCORE_BLOCK_SIZE = 16384
+
+
+class QuantizedIndex:
+    def __init__(
+        self,
+        codes: np.ndarray,
+        ids: list[str],
+        precision: str,
+        ranges: np.ndarray | None = None,
+    ):
+        self.codes = codes
+        self.ids = ids
+        self.precision = precision
+        self.ranges = ranges  # (2, dim) min/max per dimension, int8 only
+
+    @classmethod
+    def from_embeddings(
+        cls, ids: list[str], embeddings: np.ndarray, precision: str = "binary"
+    ) -> "QuantizedIndex":
+        """Quantize float embeddings (one row per ID)."""
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unknown precision: {precision}")
+
+        ranges = None
+        if precision == "int8":
+            ranges = np.vstack((embeddings.min(axis=0), embeddings.max(axis=0)))
+
+        codes = quantize_embeddings(embeddings, precision, ranges)
+        return cls(codes, list(ids), precision, ranges)
+
+    @classmethod
+    def load(cls, index_dir: Path) -> "QuantizedIndex":
+        """Load a previously saved index."""
+        with np.load(index_dir / INDEX_FILE) as data:
+            precision = str(data["precision"])
+            ranges = data["ranges"] if precision == "int8" else None
+            codes = data["codes"]
+        ids = orjson.loads((index_dir / IDS_FILE).read_bytes())
+        return cls(codes, ids, precision, ranges)
+
+    def save(self, index_dir: Path):
+        """Persist codes, quantization ranges and position -> chunk ID mapping."""
+        index_dir.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            index_dir / INDEX_FILE,
+            codes=self.codes,
+            precision=np.array(self.precision),
+            ranges=self.ranges if self.ranges is not None else np.empty(0),
+        )
+        (index_dir / IDS_FILE).write_bytes(orjson.dumps(self.ids))
+
+    def search(
+        self, query_embeddings: np.ndarray, n_candidates: int
+    ) -> list[list[str]]:
+        """
+        Find approximate nearest chunks for each query embedding.
+
+        Returns:
+            Candidate IDs, one list per query, nearest (by code distance) first
+        """
+        k = min(n_candidates, len(self.ids))
+        if k == 0:
+            return [[] for _ in range(len(query_embeddings))]
+
+        all_ids = []
+        query_codes = quantize_embeddings(query_embeddings, self.precision, self.ranges)
+        for query_code in query_codes:
+            distances = self._distances(query_code)
+            top = np.argpartition(distances, k - 1)[:k]
+            top = top[np.argsort(distances[top], kind="stable")]
+            all_ids.append([self.ids[p] for p in top])
+
+        return all_ids
+
+    def _distances(self, query_code: np.ndarray) -> np.ndarray:
+        """Code distance from one quantized query to every row."""
+        distances = np.empty(len(self.codes), dtype=np.int32)
+        for start in range(0, len(self.codes), SCORE_BLOCK_SIZE):
+            block = self.codes[start : start + SCORE_BLOCK_SIZE]
+            if self.precision == "binary":
+                distances[start : start + len(block)] = _hamming(block, query_code)
+            else:
+                diff = block.astype(np.int32) - query_code.astype(np.int32)
+                distances[start : start + len(block)] = np.einsum(
+                    "ij,ij->i", diff, diff
+                )
+        return distances
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def _hamming(codes: np.ndarray, query_code: np.ndarray) -> np.ndarray:
+    """Differing bits between each packed row and the packed query."""
+    differing = np.bitwise_xor(codes, query_code)
+    return np.bitwise_count(differing).sum(axis=1, dtype=np.int32)
+
+
+def quantize_embeddings(
+    embeddings: np.ndarray, precision: str, ranges: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    Quantize float embeddings, the same scheme as sentence-transformers'
+    quantize_embeddings ("ubinary" / "int8"). int8 needs the corpus ranges.
+    """
+    embeddings = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+    if precision == "binary":
+        return np.packbits(embeddings > 0, axis=1)
+
+    starts = ranges[0]
+    steps = (ranges[1] - starts) / 255
+    steps = np.where(steps == 0, 1, steps)
+    buckets = np.clip(np.floor((embeddings - starts) / steps), 0, 255)
+    return (buckets - 128).astype(np.int8)
@@ -2,6 +2,13 @@ from markdown_it import MarkdownIt
 import pathlib
 from typing import Any
 
+# Parser is stateless across parse() calls; build (and compile its rules) once
+_MD = MarkdownIt()
+
+LIST_OPEN = frozenset({"bullet_list_open", "ordered_list_open"})
+LIST_CLOSE = frozenset({"bullet_list_close", "ordered_list_close"})
+INLINE_SKIP = frozenset({"link_open", "link_close", "image"})
+
 
 def chunk_markdown(text: str, source: str) -> list[dict[str, Any]]:
     """
@@ -13,20 +20,20 @@ def chunk_markdown(text: str, source: str) -> list[dict[str, Any]]:
     - Proper heading hierarchy tracking
     - Better code block handling
     """
-    md = MarkdownIt()
-    tokens = md.parse(text)
+    tokens = _MD.parse(text)
 
     chunks = []
     heading_stack: list[str] = []
     current_text_parts: list[str] = []
 
-    # Track which tokens we've already processed to avoid duplication
-    i = 0
-    while i < len(tokens):
-        token = tokens[i]
+    # Single pass over the token stream; branches pull their own follow-up
+    # tokens off the iterator instead of doing index arithmetic
+    it = iter(tokens)
+    for token in it:
+        token_type = token.type
 
         # Heading: save previous chunk, update stack
-        if token.type == "heading_open":
+        if token_type == "heading_open":
             # Save accumulated text
             if current_text_parts:
                 text_content = "\n".join(current_text_parts).strip()
@@ -43,76 +50,38 @@ def chunk_markdown(text: str, source: str) -> list[dict[str, Any]]:
 
             # Extract heading level and text
             level = int(token.tag[1])
-            i += 1
+            inline = next(it, None)
             heading_text = ""
-            if i < len(tokens) and tokens[i].type == "inline":
-                heading_text = extract_inline_text(tokens[i])
+            if inline is not None and inline.type == "inline":
+                heading_text = extract_inline_text(inline)
 
             # Update heading stack (truncate to current level - 1, then append)
             heading_stack = heading_stack[: level - 1] + [heading_text]
 
-            # Skip heading_close
-            i += 2
-            continue
+            next(it, None)  # Skip heading_close
 
         # Paragraph
-        elif token.type == "paragraph_open":
-            i += 1
-            if i < len(tokens) and tokens[i].type == "inline":
-                text = extract_inline_text(tokens[i])
-                if text.strip():
+        elif token_type == "paragraph_open":
+            inline = next(it, None)
+            if inline is not None and inline.type == "inline":
+                text = extract_inline_text(inline)
+                if text and not text.isspace():
                     current_text_parts.append(text)
-            i += 2  # Skip inline and paragraph_close
-            continue
+            next(it, None)  # Skip paragraph_close
 
         # Code block / fence
-        elif token.type == "fence" or token.type == "code_block":
+        elif token_type == "fence" or token_type == "code_block":
             lang = getattr(token, "info", "") or ""
             code = token.content.rstrip("\n")
             current_text_parts.append(f"```{lang}\n{code}\n```")
-            i += 1
-            continue
 
         # Lists - process the list items, not the container
-        elif token.type == "bullet_list_open" or token.type == "ordered_list_open":
-            i += 1
-            list_text = []
-
-            # Process list items
-            while i < len(tokens) and tokens[i].type == "list_item_open":
-                i += 1
-                item_parts = []
-
-                # Collect all content in this list item
-                while i < len(tokens) and tokens[i].type != "list_item_close":
-                    if tokens[i].type == "paragraph_open":
-                        i += 1
-                        if tokens[i].type == "inline":
-                            item_text = extract_inline_text(tokens[i])
-                            item_parts.append(item_text)
-                        i += 2  # Skip inline and paragraph_close
-                    else:
-                        i += 1
-
-                if item_parts:
-                    list_text.append(" ".join(item_parts))
-
-                i += 1  # Skip list_item_close
-
+        elif token_type in LIST_OPEN:
+            list_text = _collect_list(it)
             if list_text:
                 current_text_parts.append("\n".join(list_text))
 
-            i += 1  # Skip list_close
-            continue
-
-        # HTML blocks and inline HTML - skip
-        elif token.type in ["html_block", "html_inline"]:
-            i += 1
-            continue
-
-        # Everything else
-        else:
-            i += 1
+        # HTML blocks and inline HTML, and everything else - skip
 
     # Save final chunk
     if current_text_parts:
@@ -130,32 +99,69 @@ def chunk_markdown(text: str, source: str) -> list[dict[str, Any]]:
     return chunks
 
 
+def chunk_markdown_file(path: pathlib.Path, source: str) -> list[dict[str, Any]]:
+    """Read and chunk one markdown file (picklable, for process pools)."""
+    # Stray non-UTF-8 bytes become U+FFFD instead of losing the file
+    return chunk_markdown(path.read_bytes().decode("utf-8", errors="replace"), source)
+
+
+def _collect_list(it) -> list[str]:
+    """
+    Consume the list just opened, through its matching close, returning the
+    paragraph text of each item. Nested items are tracked with a stack, so
+    each nested item becomes its own line right after its parent.
+    """
+    list_text: list[str | None] = []
+    open_items: list[tuple[int, list[str]]] = []  # (line slot, item parts)
+
+    for token in it:
+        token_type = token.type
+        if token_type == "list_item_open":
+            open_items.append((len(list_text), []))
+            list_text.append(None)
+        elif token_type == "list_item_close":
+            slot, item_parts = open_items.pop()
+            if item_parts:
+                list_text[slot] = " ".join(item_parts)
+        elif token_type == "paragraph_open":
+            inline = next(it, None)
+            if open_items and inline is not None and inline.type == "inline":
+                open_items[-1][1].append(extract_inline_text(inline))
+            next(it, None)  # Skip paragraph_close
+        elif not open_items and token_type in LIST_CLOSE:
+            break
+
+    return [line for line in list_text if line is not None]
+
+
 def extract_inline_text(token) -> str:
     """
     Extract plain text from inline token, skipping images and complex formatting.
+
+    Walks nested inline children with an explicit stack, appending leaf text
+    to one list that is joined once at the end.
     """
     if not token.children:
         return token.content
 
     parts = []
-    for child in token.children:
-        if child.type == "text":
+    stack = token.children[::-1]
+    while stack:
+        child = stack.pop()
+        child_type = child.type
+        if child_type == "text":
             parts.append(child.content)
-        elif child.type == "code_inline":
+        elif child_type == "code_inline":
             parts.append(f"`{child.content}`")
-        elif child.type == "softbreak" or child.type == "hardbreak":
+        elif child_type == "softbreak" or child_type == "hardbreak":
             parts.append("\n")
-        elif child.type == "link_open":
-            # We'll capture the link text from subsequent tokens
-            continue
-        elif child.type == "link_close":
-            continue
-        elif child.type == "image":
-            # Skip images entirely
+        elif child_type in INLINE_SKIP:
+            # Link text comes from the tokens between link_open/link_close;
+            # images are skipped entirely
             continue
-        # Recursively handle nested inlines
-        elif hasattr(child, "children") and child.children:
-            parts.append(extract_inline_text(child))
+        # Descend into nested inlines, keeping document order
+        elif child.children:
+            stack.extend(reversed(child.children))
 
     return "".join(parts)
 
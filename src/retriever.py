@@ -2,77 +2,543 @@
 Query interface for retrieving relevant documentation chunks.
 """
 
+import platform
+from collections.abc import Sequence
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple
+import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
 import chromadb
 from chromadb.config import Settings
 
+from .encoding import encode_by_length
+from .semantic_cache import SemanticCache
+
+# Dynamically int8-quantized ONNX exports, keyed by CPU architecture, as
+# (sentence-transformers quantization config, file name). The sentence-
+# transformers model repos ship these prebuilt; other models are exported and
+# quantized once into cache_dir/onnx.
+QUANTIZED_ONNX_FILES = {
+    "x86_64": ("avx2", "onnx/model_quint8_avx2.onnx"),
+    "AMD64": ("avx2", "onnx/model_quint8_avx2.onnx"),
+    "arm64": ("arm64", "onnx/model_qint8_arm64.onnx"),
+    "aarch64": ("arm64", "onnx/model_qint8_arm64.onnx"),
+}
+
+# Queries embedded per forward pass in search_batch
+QUERY_BATCH_SIZE = 32
+
+# Recent searches kept for paraphrase hits, and the cosine similarity a new
+# query needs to reuse one's results
+RESULT_CACHE_SIZE = 256
+RESULT_CACHE_THRESHOLD = 0.97
+
+
+@lru_cache(maxsize=4)
+def load_query_model(
+    model_name: str,
+    model_backend: str = "torch",
+    device: str | None = None,
+    cache_dir: Path | None = None,
+) -> SentenceTransformer:
+    """
+    Load the query embedding model, once per (name, backend, device, cache
+    dir); every retriever in the process shares it.
+
+    "torch" is the full-precision model the corpus was embedded with;
+    "onnx-int8" runs the int8-quantized ONNX export through onnxruntime,
+    which is several times faster on CPU at a negligible cost in recall.
+    On CUDA the torch model runs in bf16 (Ampere+) or fp16 (Volta+).
+    The model is warmed up before it is returned.
+    """
+    if model_backend == "torch":
+        model = SentenceTransformer(model_name, device=device)
+        if model.device.type == "cuda":
+            major, _ = torch.cuda.get_device_capability(model.device)
+            if major >= 8:
+                model.to(torch.bfloat16)
+            elif major >= 7:
+                model.half()
+    elif model_backend == "onnx-int8":
+        model = _load_quantized_onnx(model_name, device, cache_dir)
+    else:
+        raise ValueError(f"Unknown model backend: {model_backend}")
+
+    _warm_up(model)
+    return model
+
+
+def _warm_up(model: SentenceTransformer):
+    """
+    Run throwaway encodes so kernel selection / graph initialization happens
+    at startup instead of on the first user query. On CUDA, a full-length
+    input primes the long-sequence kernels too.
+    """
+    model.encode(["warmup"], batch_size=1, show_progress_bar=False)
+    if model.device.type == "cuda":
+        model.encode(
+            ["warmup " * model.max_seq_length], batch_size=1, show_progress_bar=False
+        )
+
+
+def _load_quantized_onnx(
+    model_name: str, device: str | None, cache_dir: Path | None
+) -> SentenceTransformer:
+    """
+    Load the int8 ONNX model: a copy quantized earlier into cache_dir/onnx,
+    else the prebuilt file from the model repo, else export and quantize it
+    now (once) into cache_dir/onnx.
+    """
+    config, file_name = QUANTIZED_ONNX_FILES.get(
+        platform.machine(), QUANTIZED_ONNX_FILES["x86_64"]
+    )
+    export_dir = None
+    if cache_dir is not None:
+        export_dir = cache_dir / "onnx" / model_name.replace("/", "--")
+        if (export_dir / file_name).exists():
+            return SentenceTransformer(
+                str(export_dir),
+                device=device,
+                backend="onnx",
+                model_kwargs={"file_name": file_name},
+            )
+
+    try:
+        # export=False: fail instead of silently exporting an fp32 model
+        return SentenceTransformer(
+            model_name,
+            device=device,
+            backend="onnx",
+            model_kwargs={"file_name": file_name, "export": False},
+        )
+    except OSError:
+        if export_dir is None:
+            raise
+
+    from sentence_transformers import export_dynamic_quantized_onnx_model
+
+    print(f"Quantizing {model_name} to int8 ONNX (one-time, into {export_dir})...")
+    model = SentenceTransformer(model_name, device=device, backend="onnx")
+    model.save(str(export_dir))
+    export_dynamic_quantized_onnx_model(model, config, str(export_dir))
+    return SentenceTransformer(
+        str(export_dir),
+        device=device,
+        backend="onnx",
+        model_kwargs={"file_name": file_name},
+    )
+
+
+@lru_cache(maxsize=4)
+def _get_client(path: str) -> chromadb.ClientAPI:
+    """One Chroma client per vector DB path, shared across retrievers."""
+    return chromadb.PersistentClient(
+        path=path, settings=Settings(anonymized_telemetry=False)
+    )
+
+
+class SearchHit(NamedTuple):
+    """One search result. Also readable as a dict (hit["text"]) for callers
+    written against the old dict results."""
+
+    id: str
+    text: str | None
+    metadata: dict[str, Any]
+    distance: float | None
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return getattr(self, key)
+        return tuple.__getitem__(self, key)
+
+    def __contains__(self, key) -> bool:
+        if isinstance(key, str):
+            return key in self._fields
+        return tuple.__contains__(self, key)
+
+
+@lru_cache(maxsize=64)
+def _where(
+    source_filter: str | tuple[str, ...] | None, type_filter: str | None
+) -> dict[str, Any] | None:
+    """
+    Chroma metadata filter for a (source, type) pair, built once per pair.
+    Several sources are pushed down as one $in clause instead of being
+    filtered after the search. Treat the returned dict as read-only; it is
+    shared between queries.
+    """
+    clauses = []
+    if source_filter:
+        if isinstance(source_filter, str):
+            clauses.append({"source": source_filter})
+        elif len(source_filter) == 1:
+            clauses.append({"source": source_filter[0]})
+        else:
+            clauses.append({"source": {"$in": list(source_filter)}})
+    if type_filter:
+        clauses.append({"type": type_filter})
+
+    if not clauses:
+        return None
+    if len(clauses) == 1:
+        return clauses[0]
+    # Chroma requires an explicit $and for more than one field
+    return {"$and": clauses}
+
 
 class VimproveRetriever:
-    def __init__(self, cache_dir: Path, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(
+        self,
+        cache_dir: Path,
+        model_name: str = "all-MiniLM-L6-v2",
+        index_backend: str = "chroma",
+        model_backend: str = "torch",
+        device: str | None = None,
+        result_cache_size: int = RESULT_CACHE_SIZE,
+        result_cache_threshold: float = RESULT_CACHE_THRESHOLD,
+    ):
+        """
+        Args:
+            cache_dir: Vimprove cache directory containing vector_db/
+            model_name: SentenceTransformer model used for query embedding
+            index_backend: "chroma", or "faiss" to serve unfiltered searches
+                from the FAISS index built by `embedding_pipeline.py --faiss`,
+                or "quantized" for the binary/int8 index built by
+                `embedding_pipeline.py --quantized`
+            model_backend: "torch", or "onnx-int8" for faster CPU query
+                embedding with the quantized ONNX model (exported into
+                cache_dir/onnx if the model repo doesn't ship one)
+            device: Torch device for the model (default: auto-detect)
+            result_cache_size: Recent searches whose results are reused for
+                near-identical queries (0 disables the cache)
+            result_cache_threshold: Minimum cosine similarity for reuse
+        """
         self.cache_dir = cache_dir
         self.vector_db_dir = cache_dir / "vector_db"
 
         # Load embedding model
-        self.model = SentenceTransformer(model_name)
+        self.model = load_query_model(model_name, model_backend, device, cache_dir)
 
         # Connect to Chroma
-        self.client = chromadb.PersistentClient(
-            path=str(self.vector_db_dir), settings=Settings(anonymized_telemetry=False)
-        )
+        self.client = _get_client(str(self.vector_db_dir))
 
         self.collection = self.client.get_collection("vimprove_docs")
 
+        self.result_cache = None
+        if result_cache_size > 0:
+            self.result_cache = SemanticCache(
+                max_entries=result_cache_size, threshold=result_cache_threshold
+            )
+
+        self.faiss_index = None
+        self.quantized_index = None
+        if index_backend == "faiss":
+            from .faiss_index import FaissIndex
+
+            self.faiss_index = FaissIndex.load(self.vector_db_dir)
+        elif index_backend == "quantized":
+            from .quantized_index import QuantizedIndex
+
+            self.quantized_index = QuantizedIndex.load(self.vector_db_dir)
+        elif index_backend != "chroma":
+            raise ValueError(f"Unknown index backend: {index_backend}")
+
+    def embed_queries(self, queries: list[str]) -> np.ndarray:
+        """
+        Embed queries as float32 unit vectors (the corpus is embedded
+        normalized too, see embedding_pipeline.py).
+        """
+        # A single batch pads to its own longest query. Past that, reordering
+        # the input is pointless (encode re-sorts by character count), so
+        # encode each token-length bucket separately instead
+        if len(queries) > QUERY_BATCH_SIZE:
+            embeddings = encode_by_length(
+                self.model, queries, batch_size=QUERY_BATCH_SIZE
+            )
+        else:
+            embeddings = self.model.encode(
+                queries,
+                batch_size=QUERY_BATCH_SIZE,
+                convert_to_numpy=True,
+            )
+
+        # Normalize in fp32, not in the half-precision model's dtype
+        embeddings = embeddings.astype(np.float32, copy=False)
+        embeddings /= np.maximum(
+            np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12
+        )
+        return embeddings
+
+    def embed_query(self, query: str) -> np.ndarray:
+        """Embed a query with the retriever's model."""
+        return self.embed_queries([query])[0]
+
     def search(
         self,
         query: str,
         n_results: int = 10,
-        source_filter: str | None = None,
+        source_filter: str | Sequence[str] | None = None,
         type_filter: str | None = None,
-    ) -> list[dict[str, Any]]:
+        query_embedding: np.ndarray | None = None,
+        include_text: bool = True,
+        include_distance: bool = True,
+    ) -> list[SearchHit]:
         """
         Search for relevant documentation chunks.
 
         Args:
             query: Natural language query
             n_results: Number of results to return
-            source_filter: Filter by source (e.g., "neovim-core", "telescope.nvim")
+            source_filter: Filter by source (e.g., "neovim-core", "telescope.nvim"),
+                or a list of sources to match any of (an empty list matches
+                nothing)
             type_filter: Filter by type ("vimdoc" or "markdown")
+            query_embedding: Precomputed embedding of query, from embed_query
+            include_text: Fetch chunk text; if False, "text" is None and
+                Chroma never reads the documents
+            include_distance: Return distances; if False, "distance" is None
 
         Returns:
-            List of results with text, metadata, and relevance scores
+            SearchHits (id, text, metadata, distance), nearest first
         """
-        # Embed query
-        query_embedding = self.model.encode(query).tolist()
+        return self.search_batch(
+            [query],
+            n_results=n_results,
+            source_filter=source_filter,
+            type_filter=type_filter,
+            query_embeddings=None if query_embedding is None else [query_embedding],
+            include_text=include_text,
+            include_distance=include_distance,
+        )[0]
+
+    def search_batch(
+        self,
+        queries: list[str],
+        n_results: int = 10,
+        source_filter: str | Sequence[str] | None = None,
+        type_filter: str | None = None,
+        query_embeddings: np.ndarray | list[np.ndarray] | None = None,
+        include_text: bool = True,
+        include_distance: bool = True,
+    ) -> list[list[SearchHit]]:
+        """
+        Search for several queries with one encode call and one index call.
+
+        Takes the same filters and include flags as search(), applied to every
+        query; query_embeddings, if given, holds one precomputed embedding
+        per query.
+
+        Returns:
+            One result list per query, in order
+        """
+        results: list[list[SearchHit]] = [[] for _ in queries]
+
+        # Hashable for the filter and result caches
+        if source_filter is not None and not isinstance(source_filter, str):
+            source_filter = tuple(source_filter)
+            # Any of no sources matches nothing (not "unfiltered")
+            if not source_filter:
+                return results
+
+        # Blank queries have nothing to match against
+        live = [i for i, query in enumerate(queries) if query.strip()]
+        if not live:
+            return results
 
-        # Build metadata filter
-        where = {}
-        if source_filter:
-            where["source"] = source_filter
-        if type_filter:
-            where["type"] = type_filter
+        # Embed queries (kept as one float32 array for the index call)
+        if query_embeddings is None:
+            embeddings = self.embed_queries([queries[i] for i in live])
+        else:
+            embeddings = np.asarray(
+                [query_embeddings[i] for i in live], dtype=np.float32
+            )
+
+        # Paraphrases of recent queries reuse their results
+        cache_key = (
+            n_results,
+            source_filter,
+            type_filter,
+            include_text,
+            include_distance,
+        )
+        misses = []
+        for row, i in enumerate(live):
+            cached = None
+            if self.result_cache is not None:
+                cached = self.result_cache.get(embeddings[row], cache_key)
+            if cached is None:
+                misses.append(row)
+            else:
+                results[i] = list(cached)
+        if not misses:
+            return results
+        embeddings = embeddings[misses]
+
+        where = _where(source_filter, type_filter)
+
+        # FAISS and the quantized index can't filter on metadata, so filtered
+        # queries stay on Chroma
+        if self.faiss_index is not None and not where:
+            found = self._search_faiss(
+                embeddings, n_results, include_text, include_distance
+            )
+        elif self.quantized_index is not None and not where:
+            found = self._search_quantized(
+                embeddings, n_results, include_text, include_distance
+            )
+        else:
+            found = self._search_chroma(
+                embeddings, n_results, where, include_text, include_distance
+            )
+
+        for row, embedding, hits in zip(misses, embeddings, found):
+            results[live[row]] = hits
+            if self.result_cache is not None:
+                self.result_cache.put(embedding, cache_key, tuple(hits))
+        return results
+
+    def _search_chroma(
+        self,
+        query_embeddings: np.ndarray,
+        n_results: int,
+        where: dict[str, Any] | None,
+        include_text: bool = True,
+        include_distance: bool = True,
+    ) -> list[list[SearchHit]]:
+        """Nearest-neighbour search via Chroma, one result list per query."""
+        include = ["metadatas"]
+        if include_text:
+            include.append("documents")
+        if include_distance:
+            include.append("distances")
 
-        # Query Chroma
         results = self.collection.query(
-            query_embeddings=[query_embedding],
+            query_embeddings=query_embeddings,
             n_results=n_results,
-            where=where if where else None,
-            include=["metadatas", "documents", "distances"],
+            where=where,
+            include=include,
         )
 
-        # Format results
+        # Format results; columns left out of include read as None
+        no_values = repeat(None)
+        return [
+            [
+                SearchHit(*hit)
+                for hit in zip(
+                    ids,
+                    results["documents"][q] if include_text else no_values,
+                    results["metadatas"][q],
+                    results["distances"][q] if include_distance else no_values,
+                )
+            ]
+            for q, ids in enumerate(results["ids"])
+        ]
+
+    def _search_faiss(
+        self,
+        query_embeddings: np.ndarray,
+        n_results: int,
+        include_text: bool = True,
+        include_distance: bool = True,
+    ) -> list[list[SearchHit]]:
+        """
+        Nearest-neighbour search via FAISS, hydrated from Chroma by ID with a
+        single get for every query.
+        """
+        all_ids, all_distances = self.faiss_index.search(query_embeddings, n_results)
+
+        wanted = list(dict.fromkeys(i for ids in all_ids for i in ids))
+        if not wanted:
+            return [[] for _ in all_ids]
+
+        records = self.collection.get(
+            ids=wanted,
+            include=["metadatas", "documents"] if include_text else ["metadatas"],
+        )
+        texts = records["documents"] if include_text else [None] * len(records["ids"])
+        by_id = {
+            chunk_id: (text, metadata)
+            for chunk_id, text, metadata in zip(
+                records["ids"], texts, records["metadatas"]
+            )
+        }
+
+        formatted = []
+        for ids, distances in zip(all_ids, all_distances):
+            hits = []
+            for chunk_id, distance in zip(ids, distances):
+                # Skip IDs deleted from Chroma since the index was built
+                if chunk_id not in by_id:
+                    continue
+                text, metadata = by_id[chunk_id]
+                hits.append(
+                    SearchHit(
+                        id=chunk_id,
+                        text=text,
+                        metadata=metadata,
+                        distance=distance if include_distance else None,
+                    )
+                )
+            formatted.append(hits)
+
+        return formatted
+
+    def _search_quantized(
+        self,
+        query_embeddings: np.ndarray,
+        n_results: int,
+        include_text: bool = True,
+        include_distance: bool = True,
+    ) -> list[list[SearchHit]]:
+        """
+        Prefilter candidates on the quantized codes, then rerank them by exact
+        squared L2 distance (the collection's metric) against their float32
+        embeddings, fetched from Chroma with a single get for every query.
+        """
+        from .quantized_index import RERANK_FACTOR
+
+        all_candidates = self.quantized_index.search(
+            query_embeddings, RERANK_FACTOR * n_results
+        )
+
+        wanted = list(dict.fromkeys(i for ids in all_candidates for i in ids))
+        if not wanted:
+            return [[] for _ in all_candidates]
+
+        include = ["embeddings", "metadatas"]
+        if include_text:
+            include.append("documents")
+        records = self.collection.get(ids=wanted, include=include)
+        # Skip IDs deleted from Chroma since the index was built
+        record_ids = records["ids"]
+        position = {chunk_id: i for i, chunk_id in enumerate(record_ids)}
+        vectors = np.asarray(records["embeddings"], dtype=np.float32)
+        texts = records["documents"] if include_text else [None] * len(record_ids)
+        metadatas = records["metadatas"]
+
         formatted = []
-        for i in range(len(results["ids"][0])):
+        for query, candidates in zip(query_embeddings, all_candidates):
+            rows = np.array(
+                [position[c] for c in candidates if c in position], dtype=np.intp
+            )
+            if not len(rows):
+                formatted.append([])
+                continue
+            distances = ((vectors[rows] - query) ** 2).sum(axis=1)
+            nearest = np.argsort(distances, kind="stable")[:n_results]
             formatted.append(
-                {
-                    "id": results["ids"][0][i],
-                    "text": results["documents"][0][i],
-                    "metadata": results["metadatas"][0][i],
-                    "distance": results["distances"][0][i]
-                    if "distances" in results
-                    else None,
-                }
+                [
+                    SearchHit(
+                        id=record_ids[row],
+                        text=texts[row],
+                        metadata=metadatas[row],
+                        distance=float(distance) if include_distance else None,
+                    )
+                    for row, distance in zip(rows[nearest].tolist(), distances[nearest])
+                ]
             )
 
         return formatted
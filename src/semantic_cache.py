@@ -0,0 +1,98 @@
+"""
+In-memory semantic cache for search results.
+
+Stores the embeddings of recent queries; a new query whose embedding is close
+enough (cosine similarity above the threshold) to a cached one, under the
+same search parameters, reuses its results instead of searching the index
+again. Generated LLM answers are never cached: queries that embed close
+together can still ask opposite things.
+
+Safe to share between threads: lookups and inserts hold one lock, so a reader
+never sees a slot whose vector and value come from different entries.
+"""
+
+import threading
+from collections.abc import Hashable
+from typing import Any
+
+import numpy as np
+
+
+class SemanticCache:
+    def __init__(self, max_entries: int = 1000, threshold: float = 0.95):
+        """
+        Args:
+            max_entries: Cached queries kept before evicting the least recently used
+            threshold: Minimum cosine similarity for a cache hit
+        """
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+
+    def _reset(self):
+        self._vecs: np.ndarray | None = None  # (max_entries, dim), unit rows
+        self._keys: list[Hashable | None] = [None] * self.max_entries
+        self._values: list[Any] = [None] * self.max_entries
+        self._last_used = np.zeros(self.max_entries, dtype=np.int64)
+        self._size = 0
+        self._clock = 0
+
+    def get(self, embedding: np.ndarray, key: Hashable) -> Any | None:
+        """
+        Return the value cached for the most similar query with the same key,
+        or None on a miss.
+        """
+        query = _normalize(embedding)
+        with self._lock:
+            if self._size == 0:
+                return None
+
+            sims = self._vecs[: self._size] @ query
+            candidates = np.flatnonzero(sims >= self.threshold)
+
+            # Only entries generated with identical request parameters can match
+            for slot in candidates[np.argsort(-sims[candidates])]:
+                if self._keys[slot] == key:
+                    self._touch(slot)
+                    return self._values[slot]
+
+            return None
+
+    def put(self, embedding: np.ndarray, key: Hashable, value: Any):
+        """Cache a value, evicting the least recently used entry when full."""
+        vec = _normalize(embedding)
+        with self._lock:
+            if self._vecs is None:
+                self._vecs = np.zeros(
+                    (self.max_entries, vec.shape[0]), dtype=np.float32
+                )
+
+            if self._size < self.max_entries:
+                slot = self._size
+                self._size += 1
+            else:
+                slot = int(np.argmin(self._last_used))
+
+            self._vecs[slot] = vec
+            self._keys[slot] = key
+            self._values[slot] = value
+            self._touch(slot)
+
+    def _touch(self, slot: int):
+        # Caller holds self._lock
+        self._clock += 1
+        self._last_used[slot] = self._clock
+
+    def __len__(self) -> int:
+        return self._size
+
+
+def _normalize(embedding: np.ndarray) -> np.ndarray:
+    vec = np.asarray(embedding, dtype=np.float32).ravel()
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm > 0 else vec
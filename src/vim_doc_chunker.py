@@ -1,7 +1,16 @@
 import pprint
 import re
+from collections.abc import Iterator
+from pathlib import Path
 from typing import Any
 
+# Section delimiters: a line of 10+ "=" or "-"
+_SECTION_RE = re.compile(r"^[=]{10,}$|^[-]{10,}$", re.MULTILINE)
+# Tags on a heading line: *tag-name*
+_TAG_RE = re.compile(r"\*([^*]+)\*")
+# Sub-chunk boundaries in long bodies: blank lines or "Subsection ~" markers
+_SUB_RE = re.compile(r"\n\n+|\n[A-Z].*?~\n")
+
 
 def chunk_vimdoc(text: str, source: str) -> list[dict[str, Any]]:
     """
@@ -9,60 +18,72 @@ def chunk_vimdoc(text: str, source: str) -> list[dict[str, Any]]:
     Extract heading, tags, and body for each section.
     Sub-chunk if body exceeds ~1000 tokens (4000 chars heuristic).
     """
-    section_pattern = r"^[=]{10,}$|^[-]{10,}$"
-    parts = re.split(section_pattern, text, flags=re.MULTILINE)
+    return list(iter_vimdoc(text, source))
 
-    chunks = []
 
-    for part in parts:
-        part = part.strip()
-        if not part:
+def chunk_vimdoc_file(path: Path, source: str) -> list[dict[str, Any]]:
+    """Read and chunk one help file (picklable, for process pools)."""
+    # Stray non-UTF-8 bytes become U+FFFD instead of losing the file
+    return chunk_vimdoc(path.read_bytes().decode("utf-8", errors="replace"), source)
+
+
+def iter_vimdoc(text: str, source: str) -> Iterator[dict[str, Any]]:
+    """
+    Lazily yield the chunks of chunk_vimdoc, one section at a time, without
+    materializing the list of sections.
+    """
+    for part in _iter_sections(text):
+        # Blank sections are common; test without building a stripped copy
+        if not part or part.isspace():
             continue
-        lines = part.split("\n")
-        # first non-empty line usually heading
-        heading = ""
-        heading_idx = 0
-        for i, line in enumerate(lines):
-            if line.strip():
-                heading = line.strip()
-                heading_idx = i
-                break
-        # Extract tags from heading line (pattern: *tag-name*)
-        tags = re.findall(r"\*([^*]+)\*", heading)
+        part = part.strip()
+        # first line usually heading (part is stripped, so it's non-empty)
+        nl = part.find("\n")
+        if nl == -1:
+            heading, body = part, ""
+        else:
+            heading = part[:nl].strip()
+            # body after heading, sliced straight out of the section
+            body = part[nl + 1 :].strip()
 
-        # body after heading
-        body_lines = lines[heading_idx + 1 :]
-        body = "\n".join(body_lines).strip()
+        # Extract tags from heading line (pattern: *tag-name*)
+        tags = _TAG_RE.findall(heading)
 
         # sub-chunk
         if len(body) > 4000:
             # Split on subsection markers (word followed by ~) or double newlines
-            subsections = re.split(r"\n\n+|\n[A-Z].*?~\n", body)
+            subsections = _SUB_RE.split(body)
             for sub in subsections:
+                # Skip tiny fragments (stripping only shortens, so check first)
+                if len(sub) < 100:
+                    continue
                 sub = sub.strip()
-                if len(sub) < 100:  # Skip tiny fragments
+                if len(sub) < 100:
                     continue
-                chunks.append(
-                    {
-                        "type": "vimdoc",
-                        "source": source,
-                        "heading": heading,
-                        "tags": tags,
-                        "text": sub,
-                    }
-                )
-        else:
-            chunks.append(
-                {
+                yield {
                     "type": "vimdoc",
                     "source": source,
                     "heading": heading,
                     "tags": tags,
-                    "text": body,
+                    "text": sub,
                 }
-            )
+        else:
+            yield {
+                "type": "vimdoc",
+                "source": source,
+                "heading": heading,
+                "tags": tags,
+                "text": body,
+            }
+
 
-    return chunks
+def _iter_sections(text: str) -> Iterator[str]:
+    """Text between section delimiters, as _SECTION_RE.split would give it."""
+    prev_end = 0
+    for match in _SECTION_RE.finditer(text):
+        yield text[prev_end : match.start()]
+        prev_end = match.end()
+    yield text[prev_end:]
 
 
 if __name__ == "__main__":
@@ -58,6 +58,7 @@ def main():
 
     # Check each plugin for updates
     print("Checking for updates...")
+    tracker.bulk_refresh(plugins.values())
     needs_update = []
     up_to_date = []
     errors = []
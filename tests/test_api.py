@@ -57,3 +57,56 @@ def test_query_endpoint_missing_retriever():
         client = TestClient(app)
         response = client.post("/query", json={"query": "test"})
         assert response.status_code == 503
+
+
+def test_query_batch_endpoint_missing_retriever():
+    """Test batch endpoint fails without retriever."""
+    with patch("api.retriever", None):
+        from api import app
+
+        client = TestClient(app)
+        response = client.post("/query/batch", json={"queries": [{"query": "test"}]})
+        assert response.status_code == 503
+
+
+def test_query_batch_rejects_empty_batch():
+    """Test batch endpoint validates the number of queries."""
+    from api import app
+
+    client = TestClient(app)
+    response = client.post("/query/batch", json={"queries": []})
+    assert response.status_code == 422
+
+
+def test_query_rejects_empty_source_filter_list():
+    """Test an empty source list is rejected rather than searching everything."""
+    from api import app
+
+    client = TestClient(app)
+    response = client.post("/query", json={"query": "test", "source_filter": []})
+    assert response.status_code == 422
+
+
+def test_build_prompt_includes_metadata():
+    """Test prompt lists chunk metadata and skips empty fields."""
+    from api import build_prompt
+
+    results = [
+        {
+            "text": "Vimdoc body",
+            "metadata": {"source": "neovim-core", "type": "vimdoc", "tags": "opt"},
+        },
+        {
+            "text": "Markdown body",
+            "metadata": {"source": "p", "type": "markdown", "headings": "A > B"},
+        },
+    ]
+    prompt = build_prompt("How?", results, None)
+
+    assert (
+        "**Source:** neovim-core\n**Type:** vimdoc\n**Tags:** opt\n\nVimdoc body"
+        in prompt
+    )
+    assert "**Section:** A > B\n\nMarkdown body" in prompt
+    assert "**Heading:**" not in prompt
+    assert "## Current Config" not in prompt
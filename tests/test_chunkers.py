@@ -1,5 +1,7 @@
 """Tests for document chunkers."""
 
+from src.chunk import FILE_CHUNKERS, chunk_corpus
+from src.error_logger import ErrorLogger
 from src.vim_doc_chunker import chunk_vimdoc
 from src.readme_chunker import chunk_markdown
 
@@ -102,3 +104,60 @@ Usage info here.
     chunks = chunk_markdown(sample, "test")
     find_chunk = next(c for c in chunks if "Usage" in c["text"])
     assert find_chunk["headings"] == ["Telescope", "Commands", "find_files"]
+
+
+def test_markdown_nested_lists():
+    """Nested list items stay separate lines and don't split their parent."""
+    sample = """# Setup
+
+- parent one
+  - child a
+  - child b
+- parent two
+"""
+    chunks = chunk_markdown(sample, "test")
+    assert len(chunks) == 1
+    assert chunks[0]["text"] == "parent one\nchild a\nchild b\nparent two"
+
+
+def test_chunk_corpus_dispatches_by_suffix(tmp_path):
+    """Files are chunked by type, in input order, with failures reported."""
+    (tmp_path / "help.txt").write_text("HEADING *tag*\n\nBody text.\n")
+    (tmp_path / "README.md").write_text("# Title\n\nSome text.\n")
+    files = [
+        (tmp_path / "help.txt", "core"),
+        (tmp_path / "README.md", "plugin"),
+        (tmp_path / "missing.md", "plugin"),
+    ]
+
+    error_logger = ErrorLogger(tmp_path / "errors.jsonl")
+    results = list(chunk_corpus(files, max_workers=2, error_logger=error_logger))
+
+    assert [path.name for path, _, _ in results] == [
+        "help.txt",
+        "README.md",
+        "missing.md",
+    ]
+    assert results[0][1][0]["type"] == "vimdoc"
+    assert results[1][1][0]["type"] == "markdown"
+    assert results[2][1] == [] and results[2][2] is not None
+    assert [e["source"] for e in error_logger.errors] == ["plugin/missing.md"]
+
+
+def test_chunk_corpus_isolates_chunker_errors(tmp_path, monkeypatch):
+    """A chunker bug on one file is reported for that file only."""
+    (tmp_path / "good.txt").write_text("HEADING *tag*\n\nBody text.\n")
+    (tmp_path / "bad.md").write_text("# Title\n")
+    monkeypatch.setitem(FILE_CHUNKERS, ".md", _raise_index_error)
+    files = [(tmp_path / "bad.md", "plugin"), (tmp_path / "good.txt", "core")]
+
+    error_logger = ErrorLogger(tmp_path / "errors.jsonl")
+    results = list(chunk_corpus(files, max_workers=1, error_logger=error_logger))
+
+    assert isinstance(results[0][2], IndexError)
+    assert results[1][1] and results[1][2] is None
+    assert [e["source"] for e in error_logger.errors] == ["plugin/bad.md"]
+
+
+def _raise_index_error(path, source):
+    raise IndexError("malformed")
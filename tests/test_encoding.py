@@ -0,0 +1,39 @@
+"""Tests for length-bucketed encoding."""
+
+import numpy as np
+
+from src.encoding import encode_by_length
+
+
+class StubModel:
+    """Whitespace "tokenizer"; embeds each text as [word count, call index]."""
+
+    def __init__(self):
+        self.calls = []
+
+    def tokenizer(self, texts, **kwargs):
+        return {"input_ids": [text.split() for text in texts]}
+
+    def encode(self, texts, convert_to_numpy=True, **kwargs):
+        self.calls.append(list(texts))
+        return np.array(
+            [[len(t.split()), len(self.calls)] for t in texts], dtype=np.float32
+        )
+
+
+def test_encode_by_length_groups_and_restores_order():
+    model = StubModel()
+    texts = ["a " * 300, "b", "c " * 40, "d d", "e " * 35]
+
+    embeddings = encode_by_length(model, texts, buckets=(32, 64, 128, 256))
+
+    # One encode call per occupied bucket, results back in input order
+    assert sorted(map(len, model.calls)) == [1, 2, 2]
+    assert embeddings[:, 0].tolist() == [300, 1, 40, 2, 35]
+    assert embeddings[2, 1] == embeddings[4, 1]
+
+
+def test_encode_by_length_single_bucket_is_one_call():
+    model = StubModel()
+    encode_by_length(model, ["short", "also short"])
+    assert model.calls == [["short", "also short"]]
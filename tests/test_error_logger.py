@@ -0,0 +1,22 @@
+"""Tests for the JSON Lines error log."""
+
+from src.error_logger import ErrorLogger, read_errors
+
+
+def test_error_log_round_trips_through_read_errors(tmp_path):
+    """Each logged error is one line that read_errors loads back."""
+    log_path = tmp_path / "logs" / "errors.jsonl"
+    logger = ErrorLogger(log_path)
+    assert not log_path.exists()
+
+    logger.log_error("neovim-core/a.txt", "processing_failed", "boom")
+    logger.log_error("plugins/b", "fetch_failed", "404", details={"status": 404})
+
+    entries = read_errors(log_path)
+    assert [e["source"] for e in entries] == ["neovim-core/a.txt", "plugins/b"]
+    assert entries[1]["details"] == {"status": 404}
+    assert entries == logger.errors
+
+
+def test_read_errors_missing_log(tmp_path):
+    assert read_errors(tmp_path / "errors.jsonl") == []
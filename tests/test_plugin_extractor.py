@@ -92,3 +92,65 @@ return {
         assert len(plugins) == 1
         assert "telescope.nvim" in plugins
         assert "tokyonight.nvim" not in plugins
+
+
+def test_plugin_extraction_normalized_match():
+    """Test plugin names match repos differing only in case/separators."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+
+        lock_file = tmpdir / "lazy-lock.json"
+        lock_file.write_text(json.dumps({"LuaSnip": {"version": "abc123"}}))
+
+        specs_dir = tmpdir / "lua" / "plugins"
+        specs_dir.mkdir(parents=True)
+
+        spec_file = specs_dir / "snippets.lua"
+        spec_file.write_text("""
+return { "L3MON4D3/lua-snip", "someone-else/lua_snip" }
+""")
+
+        config_file = tmpdir / "config.json"
+        config_file.write_text(
+            json.dumps({"overrides": {}, "ignore": [], "always_include": []})
+        )
+
+        plugins = extract_plugin_list(lock_file, specs_dir, config_file)
+
+        # First repo in the specs wins when several normalize the same way
+        assert plugins == {"LuaSnip": "L3MON4D3/lua-snip"}
+
+
+def test_plugin_extraction_always_include():
+    """Test always_include plugins are resolved from specs even without a lock entry."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+
+        lock_file = tmpdir / "lazy-lock.json"
+        lock_file.write_text(json.dumps({}))
+
+        specs_dir = tmpdir / "lua" / "plugins"
+        specs_dir.mkdir(parents=True)
+
+        spec_file = specs_dir / "ui.lua"
+        spec_file.write_text("""
+return { "nvim-lualine/lualine.nvim" }
+""")
+
+        config_file = tmpdir / "config.json"
+        config_file.write_text(
+            json.dumps(
+                {
+                    "overrides": {},
+                    "ignore": [],
+                    "always_include": ["lazy.nvim", "lualine.nvim", "missing.nvim"],
+                }
+            )
+        )
+
+        plugins = extract_plugin_list(lock_file, specs_dir, config_file)
+
+        assert plugins == {
+            "lazy.nvim": "folke/lazy.nvim",
+            "lualine.nvim": "nvim-lualine/lualine.nvim",
+        }
@@ -0,0 +1,34 @@
+"""Tests for the quantized prefilter index."""
+
+import numpy as np
+import pytest
+
+from src.quantized_index import QuantizedIndex
+
+
+@pytest.fixture
+def embeddings():
+    vectors = np.random.default_rng(0).standard_normal((500, 384)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+@pytest.mark.parametrize("precision", ["binary", "int8"])
+def test_quantized_index_finds_exact_match(embeddings, precision):
+    ids = [f"chunk{i}" for i in range(len(embeddings))]
+    index = QuantizedIndex.from_embeddings(ids, embeddings, precision)
+
+    candidates = index.search(embeddings[[3, 42]], n_candidates=5)
+    assert [c[0] for c in candidates] == ["chunk3", "chunk42"]
+    assert all(len(c) == 5 for c in candidates)
+
+
+def test_quantized_index_roundtrip(tmp_path, embeddings):
+    ids = [f"chunk{i}" for i in range(len(embeddings))]
+    index = QuantizedIndex.from_embeddings(ids, embeddings, "int8")
+    index.save(tmp_path)
+
+    loaded = QuantizedIndex.load(tmp_path)
+    assert loaded.precision == "int8"
+    assert loaded.ids == ids
+    assert np.array_equal(loaded.codes, index.codes)
+    assert loaded.search(embeddings[:1], 3) == index.search(embeddings[:1], 3)
@@ -44,3 +44,24 @@ def test_metadata_preserved(retriever):
     assert any(
         "heading" in r["metadata"] or "tags" in r["metadata"] for r in core_results
     )
+
+
+def test_search_batch_matches_search(retriever):
+    queries = ["telescope commands", "", "lazy loading"]
+    batch = retriever.search_batch(queries, n_results=5)
+    assert len(batch) == len(queries)
+    assert batch[1] == []
+    for query, results in zip(queries, batch):
+        expected = retriever.search(query, n_results=5)
+        assert [r["id"] for r in results] == [r["id"] for r in expected]
+
+
+def test_search_source_filter_list(retriever):
+    sources = ["neovim-core", "telescope.nvim"]
+    results = retriever.search("keymaps", n_results=10, source_filter=sources)
+    assert len(results) > 0
+    assert all(r["metadata"]["source"] in sources for r in results)
+
+
+def test_search_empty_source_filter_list_matches_nothing(retriever):
+    assert retriever.search("keymaps", n_results=10, source_filter=[]) == []
@@ -0,0 +1,63 @@
+"""Tests for the semantic response cache."""
+
+import threading
+
+import numpy as np
+
+from src.semantic_cache import SemanticCache
+
+
+def test_semantic_cache_hit_on_similar_query():
+    """Near-identical embeddings with the same key reuse the cached value."""
+    cache = SemanticCache(max_entries=10, threshold=0.95)
+    cache.put(np.array([1.0, 0.0, 0.0]), "key", "answer")
+
+    assert cache.get(np.array([0.99, 0.05, 0.0]), "key") == "answer"
+    assert cache.get(np.array([0.0, 1.0, 0.0]), "key") is None
+
+
+def test_semantic_cache_key_mismatch():
+    """Entries cached under different request parameters never match."""
+    cache = SemanticCache(max_entries=10)
+    cache.put(np.array([1.0, 0.0]), ("model-a", 10), "answer")
+
+    assert cache.get(np.array([1.0, 0.0]), ("model-b", 10)) is None
+
+
+def test_semantic_cache_evicts_least_recently_used():
+    """When full, the least recently used entry is replaced."""
+    cache = SemanticCache(max_entries=2)
+    cache.put(np.array([1.0, 0.0, 0.0]), "key", "first")
+    cache.put(np.array([0.0, 1.0, 0.0]), "key", "second")
+    cache.get(np.array([1.0, 0.0, 0.0]), "key")  # first is now most recent
+    cache.put(np.array([0.0, 0.0, 1.0]), "key", "third")
+
+    assert len(cache) == 2
+    assert cache.get(np.array([1.0, 0.0, 0.0]), "key") == "first"
+    assert cache.get(np.array([0.0, 1.0, 0.0]), "key") is None
+
+
+def test_semantic_cache_concurrent_values_match_keys():
+    """Threads hammering one cache never get another entry's value back."""
+    cache = SemanticCache(max_entries=16, threshold=0.99)
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((64, 32)).astype(np.float32)
+    errors = []
+
+    def worker(seed: int):
+        local = np.random.default_rng(seed)
+        for _ in range(2000):
+            i = int(local.integers(len(vectors)))
+            value = cache.get(vectors[i], i)
+            if value is None:
+                cache.put(vectors[i], i, i)
+            elif value != i:
+                errors.append((i, value))
+
+    threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []